@@ -17,6 +17,15 @@ class NPCPlayer:
         self.player_id = player_id
         self.difficulty = difficulty
 
+        # Cache statistics, reported by the performance tests
+        self._threat_cache_hits = 0
+        self._threat_cache_misses = 0
+
     def get_move(self, game: DabloGame) -> Move | None:
         """Get the best move for current game state"""
         raise NotImplementedError
+
+    def reset_caches(self):
+        """Reset per-game cache state so the player can be reused for a new game"""
+        self._threat_cache_hits = 0
+        self._threat_cache_misses = 0
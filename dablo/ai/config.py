@@ -1,148 +1,150 @@
 """
-AI configuration models for Dablo NPCs using Pydantic
+AI configuration models for Dablo NPCs using frozen dataclasses
 
-Provides type-safe configuration for NPC behavior, evaluation weights, and game parameters.
+Provides typed configuration for NPC behavior, evaluation weights, and game parameters.
+The settings are read from hot evaluation loops, so they are plain slotted dataclasses
+rather than Pydantic models; range checks run once when the top-level config is built.
 """
 
-from pydantic import BaseModel, Field
+from dataclasses import dataclass, field, fields
 
 
-class DifficultySettings(BaseModel):
+@dataclass(frozen=True, slots=True)
+class DifficultySettings:
     """Configuration for AI difficulty levels"""
 
-    capture_preference: float = Field(
-        ge=0.0, le=2.0, description="Weight for capture moves"
-    )
-    king_safety: float = Field(ge=0.0, le=3.0, description="Weight for king protection")
-    forward_progress: float = Field(
-        ge=0.0, le=1.0, description="Weight for advancing pieces"
-    )
-    randomness: float = Field(ge=0.0, le=1.0, description="Probability of random moves")
+    capture_preference: float  # Weight for capture moves (0.0 - 2.0)
+    king_safety: float  # Weight for king protection (0.0 - 3.0)
+    forward_progress: float  # Weight for advancing pieces (0.0 - 1.0)
+    randomness: float  # Probability of random moves (0.0 - 1.0)
 
 
-class EvaluationWeights(BaseModel):
+@dataclass(frozen=True, slots=True)
+class EvaluationWeights:
     """Weights for move evaluation heuristics"""
 
-    chain_capture_bonus: float = Field(
-        default=5.0, ge=0.0, description="Bonus for chain captures"
-    )
-    center_control: float = Field(
-        default=0.3, ge=0.0, description="Weight for center control"
-    )
-    piece_protection: float = Field(
-        default=0.4, ge=0.0, description="Weight for piece protection"
-    )
-    threat_creation: float = Field(
-        default=0.5, ge=0.0, description="Weight for creating threats"
-    )
-    max_threat_value: float = Field(
-        default=2.0, ge=0.0, description="Maximum threat evaluation score"
-    )
+    chain_capture_bonus: float = 5.0  # Bonus for chain captures
+    center_control: float = 0.3  # Weight for center control
+    piece_protection: float = 0.4  # Weight for piece protection
+    threat_creation: float = 0.5  # Weight for creating threats
+    max_threat_value: float = 2.0  # Maximum threat evaluation score
+    # Score the heuristics that read capture threats off the board after a move:
+    # the king capture check, piece protection and threat creation. Off, they
+    # score nothing, as in the original evaluation (whose analysis games had no
+    # pieces to move), which the difficulty presets were first balanced against.
+    threat_heuristics: bool = True
 
 
-class KingSafetyConfig(BaseModel):
+@dataclass(frozen=True, slots=True)
+class KingSafetyConfig:
     """Configuration for king safety evaluation"""
 
-    capture_danger_penalty: float = Field(
-        default=-5.0, le=0.0, description="Penalty for king in capture danger"
-    )
-    immediate_threat_penalty: float = Field(
-        default=-50.0, le=0.0, description="Penalty for missing king"
-    )
-    close_distance_penalty: float = Field(
-        default=-4.0, le=0.0, description="Penalty for close enemy pieces"
-    )
-    medium_distance_penalty: float = Field(
-        default=-2.0, le=0.0, description="Penalty for medium distance threats"
-    )
-    safe_distance_bonus: float = Field(
-        default=0.2, ge=0.0, description="Bonus for safe positioning"
-    )
-    very_safe_bonus: float = Field(
-        default=0.5, ge=0.0, description="Bonus for very safe positioning"
-    )
+    capture_danger_penalty: float = -5.0  # Penalty for king in capture danger
+    immediate_threat_penalty: float = -50.0  # Penalty for missing king
+    close_distance_penalty: float = -4.0  # Penalty for close enemy pieces
+    medium_distance_penalty: float = -2.0  # Penalty for medium distance threats
+    safe_distance_bonus: float = 0.2  # Bonus for safe positioning
+    very_safe_bonus: float = 0.5  # Bonus for very safe positioning
 
     # Distance thresholds
-    immediate_danger_threshold: float = Field(
-        default=1.1, gt=0.0, description="Immediate danger distance"
-    )
-    close_danger_threshold: float = Field(
-        default=1.6, gt=0.0, description="Close danger distance"
-    )
-    medium_safety_threshold: float = Field(
-        default=2.5, gt=0.0, description="Medium safety distance"
-    )
+    immediate_danger_threshold: float = 1.1  # Immediate danger distance
+    close_danger_threshold: float = 1.6  # Close danger distance
+    medium_safety_threshold: float = 2.5  # Medium safety distance
 
 
-class CenterControlConfig(BaseModel):
+@dataclass(frozen=True, slots=True)
+class CenterControlConfig:
     """Configuration for center control evaluation"""
 
-    center_rows: set[float] = Field(
-        default={2.0, 2.5, 3.0}, description="Center row positions"
-    )
-    center_cols: set[float] = Field(
-        default={1.5, 2.0, 2.5}, description="Center column positions"
-    )
-    row_bonus: float = Field(
-        default=0.3, ge=0.0, description="Bonus for center row control"
-    )
-    col_bonus: float = Field(
-        default=0.3, ge=0.0, description="Bonus for center column control"
-    )
-
-
-class MoveSelectionConfig(BaseModel):
+    # Center row and column positions
+    center_rows: frozenset[float] = frozenset({2.0, 2.5, 3.0})
+    center_cols: frozenset[float] = frozenset({1.5, 2.0, 2.5})
+    row_bonus: float = 0.3  # Bonus for center row control
+    col_bonus: float = 0.3  # Bonus for center column control
+
+    # The center rows and columns as bitmasks over twice their value (positions
+    # are in half steps), built once in __post_init__
+    _center_rows_mask: int = field(init=False, repr=False, compare=False)
+    _center_cols_mask: int = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        """Encode the center rows and columns as bitmasks"""
+        for name, values in (
+            ("_center_rows_mask", self.center_rows),
+            ("_center_cols_mask", self.center_cols),
+        ):
+            mask = 0
+            for value in values:
+                mask |= 1 << int(2 * value)
+            object.__setattr__(self, name, mask)
+
+    def position_bonus(self, pos: tuple[float, float]) -> float:
+        """Get the center control bonus for a (row, col) position"""
+        row, col = pos
+        return (
+            self.row_bonus if self._center_rows_mask >> int(2 * row) & 1 else 0.0
+        ) + (self.col_bonus if self._center_cols_mask >> int(2 * col) & 1 else 0.0)
+
+
+@dataclass(frozen=True, slots=True)
+class MoveSelectionConfig:
     """Configuration for move selection logic"""
 
-    top_moves_count: int = Field(
-        default=3, ge=1, le=10, description="Number of top moves to consider"
-    )
-    selection_weights: list[int] = Field(
-        default=[3, 2, 1], description="Weights for top move selection"
-    )
-    forward_progress_multiplier: float = Field(
-        default=0.5, ge=0.0, description="Multiplier for forward progress"
-    )
-    min_piece_value_for_protection: float = Field(
-        default=2.0, ge=0.0, description="Minimum piece value to evaluate protection"
-    )
+    top_moves_count: int = 3  # Number of top moves to consider (1 - 10)
+    selection_weights: tuple[int, ...] = (3, 2, 1)  # Weights for top move selection
+    forward_progress_multiplier: float = 0.5  # Multiplier for forward progress
+    # Minimum piece value to evaluate protection
+    min_piece_value_for_protection: float = 2.0
 
 
-class PerformanceTestConfig(BaseModel):
+@dataclass(frozen=True, slots=True)
+class PerformanceTestConfig:
     """Configuration for NPC performance testing"""
 
-    default_move_limit: int = Field(
-        default=150, ge=50, le=1000, description="Default move limit for test games"
-    )
-    default_game_count: int = Field(
-        default=67, ge=1, le=1000, description="Default number of test games"
-    )
-    test_matchups: list[tuple[str, str, str, str]] = Field(
-        default=[
-            ("smart", "random", "hard", "medium"),
-            ("aggressive", "defensive", "hard", "medium"),
-            ("smart", "aggressive", "hard", "hard"),
-            ("smart", "defensive", "hard", "medium"),
-            # Additional cross-type scenarios
-            ("aggressive", "random", "hard", "medium"),
-            ("defensive", "random", "medium", "medium"),
-            ("aggressive", "smart", "hard", "hard"),
-            ("defensive", "smart", "medium", "hard"),
-            # Difficulty variation tests
-            ("smart", "smart", "easy", "hard"),
-            ("aggressive", "aggressive", "medium", "hard"),
-            ("defensive", "defensive", "easy", "medium"),
-            # Style mirror matches
-            ("random", "random", "medium", "medium"),
-            ("smart", "smart", "hard", "hard"),
-            ("aggressive", "aggressive", "medium", "medium"),
-            ("defensive", "defensive", "easy", "easy"),
-        ],
-        description="Default test matchups (npc1_type, npc2_type, npc1_diff, npc2_diff)",
-    )
-
-
-class NPCConfig(BaseModel):
+    default_move_limit: int = 150  # Default move limit for test games (50 - 1000)
+    default_game_count: int = 67  # Default number of test games (1 - 1000)
+
+    # Default test matchups (npc1_type, npc2_type, npc1_diff, npc2_diff)
+    test_matchups: tuple[tuple[str, str, str, str], ...] = (
+        ("smart", "random", "hard", "medium"),
+        ("aggressive", "defensive", "hard", "medium"),
+        ("smart", "aggressive", "hard", "hard"),
+        ("smart", "defensive", "hard", "medium"),
+        # Additional cross-type scenarios
+        ("aggressive", "random", "hard", "medium"),
+        ("defensive", "random", "medium", "medium"),
+        ("aggressive", "smart", "hard", "hard"),
+        ("defensive", "smart", "medium", "hard"),
+        # Difficulty variation tests
+        ("smart", "smart", "easy", "hard"),
+        ("aggressive", "aggressive", "medium", "hard"),
+        ("defensive", "defensive", "easy", "medium"),
+        # Style mirror matches
+        ("random", "random", "medium", "medium"),
+        ("smart", "smart", "hard", "hard"),
+        ("aggressive", "aggressive", "medium", "medium"),
+        ("defensive", "defensive", "easy", "easy"),
+    )
+
+
+def _check_range(
+    name: str,
+    value: float,
+    ge: float | None = None,
+    le: float | None = None,
+    gt: float | None = None,
+):
+    """Raise ValueError if a configuration value falls outside its allowed range"""
+    if (
+        (ge is not None and value < ge)
+        or (le is not None and value > le)
+        or (gt is not None and value <= gt)
+    ):
+        raise ValueError(f"Invalid NPC configuration value {name}={value!r}")
+
+
+@dataclass(frozen=True, slots=True)
+class NPCConfig:
     """Main NPC configuration containing all settings"""
 
     # Difficulty presets - tuned for better balance
@@ -180,16 +182,85 @@ class NPCConfig(BaseModel):
     move_selection: MoveSelectionConfig = MoveSelectionConfig()
     performance_test: PerformanceTestConfig = PerformanceTestConfig()
 
+    # Difficulty name lookup, built once in __post_init__
+    _difficulty_map: dict[str, DifficultySettings] = field(
+        init=False, repr=False, compare=False
+    )
+
+    def __post_init__(self):
+        """Validate all settings once, when the configuration is built"""
+        for name in ("easy", "medium", "hard", "aggressive", "defensive"):
+            settings: DifficultySettings = getattr(self, name)
+            _check_range(
+                f"{name}.capture_preference", settings.capture_preference, 0.0, 2.0
+            )
+            _check_range(f"{name}.king_safety", settings.king_safety, 0.0, 3.0)
+            _check_range(
+                f"{name}.forward_progress", settings.forward_progress, 0.0, 1.0
+            )
+            _check_range(f"{name}.randomness", settings.randomness, 0.0, 1.0)
+
+        for config_field in fields(self.evaluation):
+            _check_range(
+                f"evaluation.{config_field.name}",
+                getattr(self.evaluation, config_field.name),
+                0.0,
+            )
+
+        for config_field in fields(self.king_safety):
+            value = getattr(self.king_safety, config_field.name)
+            if config_field.name.endswith("_threshold"):
+                _check_range(f"king_safety.{config_field.name}", value, gt=0.0)
+            elif config_field.name.endswith("_penalty"):
+                _check_range(f"king_safety.{config_field.name}", value, le=0.0)
+            else:
+                _check_range(f"king_safety.{config_field.name}", value, ge=0.0)
+
+        _check_range("center_control.row_bonus", self.center_control.row_bonus, 0.0)
+        _check_range("center_control.col_bonus", self.center_control.col_bonus, 0.0)
+
+        selection = self.move_selection
+        _check_range("move_selection.top_moves_count", selection.top_moves_count, 1, 10)
+        _check_range(
+            "move_selection.forward_progress_multiplier",
+            selection.forward_progress_multiplier,
+            0.0,
+        )
+        _check_range(
+            "move_selection.min_piece_value_for_protection",
+            selection.min_piece_value_for_protection,
+            0.0,
+        )
+
+        performance = self.performance_test
+        _check_range(
+            "performance_test.default_move_limit",
+            performance.default_move_limit,
+            50,
+            1000,
+        )
+        _check_range(
+            "performance_test.default_game_count",
+            performance.default_game_count,
+            1,
+            1000,
+        )
+
+        object.__setattr__(
+            self,
+            "_difficulty_map",
+            {
+                "easy": self.easy,
+                "medium": self.medium,
+                "hard": self.hard,
+                "aggressive": self.aggressive,
+                "defensive": self.defensive,
+            },
+        )
+
     def get_difficulty_settings(self, difficulty: str) -> DifficultySettings:
         """Get difficulty settings by name"""
-        difficulty_map = {
-            "easy": self.easy,
-            "medium": self.medium,
-            "hard": self.hard,
-            "aggressive": self.aggressive,
-            "defensive": self.defensive,
-        }
-        return difficulty_map.get(difficulty, self.medium)
+        return self._difficulty_map.get(difficulty, self.medium)
 
 
 # Global configuration instance
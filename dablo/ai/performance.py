@@ -1,56 +1,118 @@
-from multiprocessing import Pool, cpu_count
+from collections import Counter
+from contextlib import nullcontext
+from dataclasses import dataclass
+from functools import lru_cache, partial
+from multiprocessing import cpu_count, get_context
+from multiprocessing.pool import Pool as WorkerPool
+import sys
 from typing import Any
 import warnings
 
+import numpy as np
+
 from ..core.config import DabloConfig
 from ..core.game import DabloGame
 from ..core.player import Player
+from ..core.rules import WinReason
+from .base import NPCPlayer
 from .config import npc_config
 from .players import create_npc_player
 
 
-# Suppress annoying multiprocessing warnings
-warnings.filterwarnings(
-    "ignore", message=".*found in sys.modules.*", category=RuntimeWarning
-)
+# Suppress the "found in sys.modules" warning runpy emits for
+# `python -m dablo.ai.performance`, since dablo.ai already imports this module
+warnings.filterwarnings("ignore", category=RuntimeWarning, module="runpy")
+
+
+@dataclass(frozen=True, slots=True)
+class GameResult:
+    """Outcome of a single simulated NPC game, as sent back from pool workers"""
+
+    game_num: int
+    winner: Player | None
+    moves: int
+    reason: WinReason | str | None
+    threat_hits: int
+    threat_misses: int
+
+
+# Game configuration shared by every game a worker process runs (see _init_worker).
+# DabloConfig is frozen, so one instance can back all of them.
+_worker_config = DabloConfig(move_limit=npc_config.performance_test.default_move_limit)
+
+
+def _init_worker(move_limit: int):
+    """Pool initializer: build the game configuration once per worker process"""
+    global _worker_config
+    if _worker_config.move_limit != move_limit:
+        _worker_config = DabloConfig(move_limit=move_limit)
+
+
+def create_worker_pool(processes: int, move_limit: int | None = None) -> WorkerPool:
+    """Create a process pool whose workers are initialised for run_single_game"""
+    if move_limit is None:
+        move_limit = npc_config.performance_test.default_move_limit
+
+    if sys.platform == "linux":
+        # Workers are forked from a server process that has already imported the
+        # package (and pydantic/numpy with it), so they skip the import entirely
+        context = get_context("forkserver")
+        context.set_forkserver_preload(["dablo.ai.performance"])
+    else:
+        context = get_context("spawn")
+
+    return context.Pool(
+        processes=processes, initializer=_init_worker, initargs=(move_limit,)
+    )
+
+
+@lru_cache(maxsize=16)
+def _get_cached_npc(npc_type: str, player: Player, difficulty: str) -> NPCPlayer:
+    """Build an NPC once per process and reuse it for every game of a matchup"""
+    return create_npc_player(player=player, npc_type=npc_type, difficulty=difficulty)
 
 
-def run_single_game(args):
-    """Run a single game between two NPCs - designed for multiprocessing"""
-    game_num, npc1_type, npc2_type, npc1_diff, npc2_diff, move_limit = args
+def run_single_game(
+    game_num: int, npc1_type: str, npc2_type: str, npc1_diff: str, npc2_diff: str
+) -> GameResult:
+    """
+    Run a single game between two NPCs - designed for multiprocessing
 
-    game = DabloGame(config=DabloConfig(move_limit=move_limit))
-    npc1 = create_npc_player(player=Player.P1, npc_type=npc1_type, difficulty=npc1_diff)
-    npc2 = create_npc_player(player=Player.P2, npc_type=npc2_type, difficulty=npc2_diff)
+    The matchup arguments are bound with functools.partial, so only ``game_num``
+    is sent per task; the game configuration comes from the worker initializer.
+    """
+    game = DabloGame(config=_worker_config)
+    npc1 = _get_cached_npc(npc1_type, Player.P1, npc1_diff)
+    npc2 = _get_cached_npc(npc2_type, Player.P2, npc2_diff)
     npcs = {Player.P1: npc1, Player.P2: npc2}
+    for npc in npcs.values():
+        npc.reset_caches()
 
-    # Game loop
+    # Game loop. game_over and current_player are plain attributes, so only the
+    # per-ply method lookups are worth hoisting out of the loop.
+    get_move = {player: npc.get_move for player, npc in npcs.items()}
+    make_move = game.make_move
     while not game.game_over:
-        current_npc = npcs[game.current_player]
-        move = current_npc.get_move(game)
-
-        if move:
-            success, _ = game.make_move(move)
-            if not success:
-                game.end_game(winner=-game.current_player, reason="invalid_move_bug")
-        else:
+        move = get_move[game.current_player](game)
+        if move is None:
             break
 
-    # Collect cache stats if available
-    threat_hits = threat_misses = 0
-    for npc in npcs.values():
-        if hasattr(npc, "_threat_cache_hits"):
-            threat_hits += npc._threat_cache_hits
-            threat_misses += npc._threat_cache_misses
+        success, _ = make_move(move)
+        if not success:
+            game.end_game(winner=-game.current_player, reason="invalid_move_bug")
 
-    return {
-        "game_num": game_num,
-        "winner": game.winner,
-        "moves": game.move_count,
-        "reason": game.win_reason,
-        "threat_hits": threat_hits,
-        "threat_misses": threat_misses,
-    }
+    # Collect cache stats
+    threat_hits = npc1._threat_cache_hits + npc2._threat_cache_hits
+    threat_misses = npc1._threat_cache_misses + npc2._threat_cache_misses
+
+    return GameResult(
+        game_num=game_num,
+        winner=game.winner,
+        moves=game.move_count,
+        reason=game.win_reason,
+        threat_hits=threat_hits,
+        threat_misses=threat_misses,
+    )
 
 
 def evaluate_npc_performance(
@@ -60,95 +122,124 @@ def evaluate_npc_performance(
     npc2_diff: str = "medium",
     n_games: int = 50,
     parallel: bool = True,
+    pool: WorkerPool | None = None,
+    return_games: bool = False,
 ) -> dict[str, Any]:
-    """Evaluates NPC performance by simulating games between two AI opponents."""
+    """
+    Evaluates NPC performance by simulating games between two AI opponents.
+
+    Pass an existing ``pool`` to reuse its workers across several calls instead
+    of starting (and importing the package in) a fresh pool per matchup.
+    Per-game results are aggregated as they arrive; set ``return_games`` to also
+    keep them in ``results["games"]``.
+    """
 
     results = {"npc1_wins": 0, "npc2_wins": 0, "draws": 0}
     move_limit = npc_config.performance_test.default_move_limit
 
-    if parallel and n_games > 1:
-        # Parallel execution
-        game_args = [
-            (game_num, npc1_type, npc2_type, npc1_diff, npc2_diff, move_limit)
-            for game_num in range(1, n_games + 1)
-        ]
+    play_game = partial(
+        run_single_game,
+        npc1_type=npc1_type,
+        npc2_type=npc2_type,
+        npc1_diff=npc1_diff,
+        npc2_diff=npc2_diff,
+    )
+    game_nums = range(1, n_games + 1)
 
+    if parallel and n_games > 1:
         # Use all available CPU cores, but cap at reasonable number
         num_processes = min(cpu_count(), n_games, 8)
-        print(f"    Running {n_games} games in parallel on {num_processes} cores...")
+        if pool is None:
+            print(
+                f"    Running {n_games} games in parallel on {num_processes} cores..."
+            )
+        else:
+            print(f"    Running {n_games} games in parallel on the shared pool...")
 
-        with Pool(processes=num_processes) as pool:
-            game_details = pool.map(run_single_game, game_args)
+        # Game lengths vary a lot, so hand out small chunks and collect results
+        # as they finish instead of waiting on the slowest game of each chunk.
+        # Aggregation below is order-independent.
+        chunksize = max(1, n_games // (num_processes * 4))
+        pool_context = (
+            create_worker_pool(num_processes, move_limit)
+            if pool is None
+            else nullcontext(pool)
+        )
     else:
         # Sequential execution (for debugging or small runs)
-        game_details = []
-        for game_num in range(1, n_games + 1):
-            game_args = (
-                game_num,
-                npc1_type,
-                npc2_type,
-                npc1_diff,
-                npc2_diff,
-                move_limit,
-            )
-            game_details.append(run_single_game(game_args))
-
-    # Process results from parallel execution
-    total_threat_hits = sum(game.get("threat_hits", 0) for game in game_details)
-    total_threat_misses = sum(game.get("threat_misses", 0) for game in game_details)
-
-    # Count wins and draws
-    for game in game_details:
-        if game["winner"] == Player.P1:
-            results["npc1_wins"] += 1
-        elif game["winner"] == Player.P2:
-            results["npc2_wins"] += 1
+        _init_worker(move_limit)
+        pool_context = nullcontext()
+
+    # Aggregate win/draw counts, win reasons and cache counters in a single pass
+    # over the results as they stream in; only game lengths are kept, in a compact
+    # int32 buffer for the statistics below
+    total = 0
+    moves_arr = np.empty(n_games, dtype=np.int32)
+    npc1_win_moves_sum = npc2_win_moves_sum = 0
+    total_threat_hits = total_threat_misses = 0
+    win_reasons = Counter()
+    game_details = [] if return_games else None
+
+    # Compare winners against plain ints held in locals
+    p1_value = Player.P1.value
+    p2_value = Player.P2.value
+
+    with pool_context as worker_pool:
+        if worker_pool is None:
+            games = map(play_game, game_nums)
         else:
-            results["draws"] += 1
+            games = worker_pool.imap_unordered(
+                play_game, game_nums, chunksize=chunksize
+            )
 
-    # Calculate and return final statistics
-    total = len(game_details)
-    if total > 0:
-        moves_list = [g["moves"] for g in game_details]
-        npc1_wins_moves = [g["moves"] for g in game_details if g["winner"] == Player.P1]
-        npc2_wins_moves = [g["moves"] for g in game_details if g["winner"] == Player.P2]
+        for game in games:
+            moves_arr[total] = game.moves
+            total += 1
+
+            if game.winner == p1_value:
+                results["npc1_wins"] += 1
+                npc1_win_moves_sum += game.moves
+            elif game.winner == p2_value:
+                results["npc2_wins"] += 1
+                npc2_win_moves_sum += game.moves
+            else:
+                results["draws"] += 1
 
-        # Win reason analysis
-        win_reasons = {}
-        for game in game_details:
-            reason = game.get("reason", "unknown")
-            win_reasons[reason] = win_reasons.get(reason, 0) + 1
+            win_reasons[game.reason] += 1
+            total_threat_hits += game.threat_hits
+            total_threat_misses += game.threat_misses
 
+            if game_details is not None:
+                game_details.append(game)
+
+    # Calculate and return final statistics
+    if total > 0:
+        moves_arr = moves_arr[:total]
         results.update(
             {
                 "npc1_win_rate": results["npc1_wins"] / total,
                 "npc2_win_rate": results["npc2_wins"] / total,
                 "draw_rate": results["draws"] / total,
-                "avg_moves": sum(moves_list) / total,
-                "min_moves": min(moves_list),
-                "max_moves": max(moves_list),
-                "moves_std": (
-                    sum(
-                        (x - sum(moves_list) / len(moves_list)) ** 2 for x in moves_list
-                    )
-                    / len(moves_list)
-                )
-                ** 0.5,
-                "npc1_avg_win_moves": sum(npc1_wins_moves) / len(npc1_wins_moves)
-                if npc1_wins_moves
+                "avg_moves": float(moves_arr.mean()),
+                "min_moves": int(moves_arr.min()),
+                "max_moves": int(moves_arr.max()),
+                "moves_std": float(moves_arr.std()),
+                "npc1_avg_win_moves": npc1_win_moves_sum / results["npc1_wins"]
+                if results["npc1_wins"]
                 else 0,
-                "npc2_avg_win_moves": sum(npc2_wins_moves) / len(npc2_wins_moves)
-                if npc2_wins_moves
+                "npc2_avg_win_moves": npc2_win_moves_sum / results["npc2_wins"]
+                if results["npc2_wins"]
                 else 0,
                 "win_reasons": win_reasons,
-                "games_over_100_moves": sum(1 for m in moves_list if m > 100),
-                "games_under_50_moves": sum(1 for m in moves_list if m < 50),
+                "games_over_100_moves": int(np.count_nonzero(moves_arr > 100)),
+                "games_under_50_moves": int(np.count_nonzero(moves_arr < 50)),
                 # Cache statistics
                 "cache_threat_hits": total_threat_hits,
                 "cache_threat_misses": total_threat_misses,
             }
         )
-    results["games"] = game_details
+    if game_details is not None:
+        results["games"] = game_details
     return results
 
 
@@ -158,44 +249,52 @@ if __name__ == "__main__":
     print("=" * 40)
 
     n_games = 100  # Reduced for testing lookahead performance
-    for matchup in npc_config.performance_test.test_matchups:
-        npc1, npc2, diff1, diff2 = matchup
-        print(
-            f"\n{npc1.title()} ({diff1}) vs {npc2.title()} ({diff2}) ({n_games} games)"
-        )
 
-        results = evaluate_npc_performance(
-            npc1, npc2, diff1, diff2, n_games=n_games, parallel=True
-        )
+    # One pool for all matchups, so workers start and import the package once
+    with create_worker_pool(min(cpu_count(), n_games, 8)) as shared_pool:
+        for matchup in npc_config.performance_test.test_matchups:
+            npc1, npc2, diff1, diff2 = matchup
+            print(
+                f"\n{npc1.title()} ({diff1}) vs {npc2.title()} ({diff2}) ({n_games} games)"
+            )
 
-        print(
-            f"  - {npc1.title()} Wins: {results.get('npc1_win_rate', 0):.1%} (avg {results.get('npc1_avg_win_moves', 0):.1f} moves)"
-        )
-        print(
-            f"  - {npc2.title()} Wins: {results.get('npc2_win_rate', 0):.1%} (avg {results.get('npc2_avg_win_moves', 0):.1f} moves)"
-        )
-        print(f"  - Draws: {results.get('draw_rate', 0):.1%}")
-        print(
-            f"  - Move Stats: {results.get('avg_moves', 0):.1f}±{results.get('moves_std', 0):.1f} (range: {results.get('min_moves', 0)}-{results.get('max_moves', 0)})"
-        )
-        print(
-            f"  - Game Length: {results.get('games_under_50_moves', 0)} short (<50), {results.get('games_over_100_moves', 0)} long (>100)"
-        )
-        if results.get("win_reasons"):
-            reasons_str = ", ".join(
-                [
-                    f"{reason}: {count}"
-                    for reason, count in results.get("win_reasons", {}).items()
-                ]
+            results = evaluate_npc_performance(
+                npc1,
+                npc2,
+                diff1,
+                diff2,
+                n_games=n_games,
+                parallel=True,
+                pool=shared_pool,
             )
-            print(f"  - Win Reasons: {reasons_str}")
 
-        # Cache statistics
-        threat_total = results.get("cache_threat_hits", 0) + results.get(
-            "cache_threat_misses", 0
-        )
-        if threat_total > 0:
-            threat_rate = results.get("cache_threat_hits", 0) / threat_total * 100
+            # Every statistic is present after aggregation (n_games > 0)
+            win_reasons = results["win_reasons"]
+            threat_hits = results["cache_threat_hits"]
+
+            print(
+                f"  - {npc1.title()} Wins: {results['npc1_win_rate']:.1%} (avg {results['npc1_avg_win_moves']:.1f} moves)"
+            )
             print(
-                f"  - Cache Hit Rate: {threat_rate:.1f}% ({results.get('cache_threat_hits', 0)}/{threat_total})"
+                f"  - {npc2.title()} Wins: {results['npc2_win_rate']:.1%} (avg {results['npc2_avg_win_moves']:.1f} moves)"
             )
+            print(f"  - Draws: {results['draw_rate']:.1%}")
+            print(
+                f"  - Move Stats: {results['avg_moves']:.1f}±{results['moves_std']:.1f} (range: {results['min_moves']}-{results['max_moves']})"
+            )
+            print(
+                f"  - Game Length: {results['games_under_50_moves']} short (<50), {results['games_over_100_moves']} long (>100)"
+            )
+            if win_reasons:
+                reasons_str = ", ".join(
+                    f"{reason}: {count}" for reason, count in win_reasons.items()
+                )
+                print(f"  - Win Reasons: {reasons_str}")
+
+            # Cache statistics
+            threat_total = threat_hits + results["cache_threat_misses"]
+            if threat_total > 0:
+                threat_rate = threat_hits / threat_total * 100
+                print(
+                    f"  - Cache Hit Rate: {threat_rate:.1f}% ({threat_hits}/{threat_total})"
+                )
@@ -5,10 +5,18 @@ Provides strategic AI opponents at various difficulty levels and play styles.
 Includes smart, aggressive, defensive, and random NPC variants.
 """
 
+from collections import OrderedDict
+from functools import cache
+import heapq
+from operator import attrgetter
 import random
+from typing import NamedTuple
 
-from ..core.game import DabloGame
-from ..core.pieces import PieceType, get_piece_value
+import numpy as np
+
+from ..core.board import BitBoards, BoardGeometry
+from ..core.game import DabloGame, generate_moves
+from ..core.pieces import PIECE_VALUES, PieceType
 from ..core.player import Player
 from ..core.rules import Move
 from .base import NPCPlayer
@@ -19,6 +27,110 @@ P1_KING = PieceType.P1_KING
 P2_KING = PieceType.P2_KING
 EMPTY = PieceType.EMPTY
 
+# Maximum number of threat levels cached per player (least recently used evicted)
+THREAT_CACHE_SIZE = 1 << 16
+
+# Maximum number of positions whose top move ranking is cached per player (least
+# recently used evicted)
+RANKING_CACHE_SIZE = 4096
+
+# King safety score by squared distance to the nearest enemy piece: the first
+# entry whose squared threshold exceeds it applies
+KING_DISTANCE_SCORES = tuple(
+    (threshold * threshold, score)
+    for threshold, score in (
+        (
+            npc_config.king_safety.immediate_danger_threshold,
+            npc_config.king_safety.close_distance_penalty,
+        ),
+        (
+            npc_config.king_safety.close_danger_threshold,
+            npc_config.king_safety.medium_distance_penalty,
+        ),
+        (
+            npc_config.king_safety.medium_safety_threshold,
+            npc_config.king_safety.safe_distance_bonus,
+        ),
+    )
+)
+
+
+# Strategic piece value by rank, for scoring captures of whole move lists at once
+PIECE_VALUE_BY_RANK = np.array(PIECE_VALUES[: P1_KING + 1])
+
+
+@cache
+def _center_bonus_by_cell(positions: tuple[tuple[float, float], ...]) -> np.ndarray:
+    """
+    Get the center control bonus of each cell of a board, as a read-only table built
+    once per board
+    """
+    bonuses = np.array(
+        [npc_config.center_control.position_bonus(pos) for pos in positions]
+    )
+    bonuses.flags.writeable = False
+    return bonuses
+
+
+# Best score king safety can give, for bounding move evaluations
+MAX_KING_SAFETY_SCORE = max(
+    npc_config.king_safety.immediate_threat_penalty,
+    npc_config.king_safety.capture_danger_penalty,
+    npc_config.king_safety.very_safe_bonus,
+    *(score for _, score in KING_DISTANCE_SCORES),
+)
+
+
+@cache
+def _king_distance_masks(
+    positions: tuple[tuple[float, float], ...],
+) -> tuple[tuple[int, ...], ...]:
+    """
+    Get, for a king on each cell, the bitmask of cells within each threshold of
+    KING_DISTANCE_SCORES
+    """
+    return tuple(
+        tuple(
+            sum(
+                1 << other
+                for other, (r, c) in enumerate(positions)
+                if (kr - r) * (kr - r) + (kc - c) * (kc - c) < sq_threshold
+            )
+            for sq_threshold, _ in KING_DISTANCE_SCORES
+        )
+        for kr, kc in positions
+    )
+
+
+class MoveCells(NamedTuple):
+    """The from, to and capture cells of a move list (-1 for no capture)"""
+
+    from_: np.ndarray
+    to: np.ndarray
+    capture: np.ndarray
+
+
+class EvalBoard(NamedTuple):
+    """
+    A board under evaluation: piece values by cell, bitboards, and the Zobrist
+    hashes of the board and of its left-right mirror image
+    """
+
+    cells: np.ndarray
+    bitboards: BitBoards
+    zobrist: int
+    mirror_zobrist: int
+
+    @classmethod
+    def from_cells(cls, cells: np.ndarray, geometry: BoardGeometry) -> "EvalBoard":
+        """Build the evaluation board for an int8 cell array"""
+        return cls(
+            cells,
+            BitBoards.from_cells(cells),
+            geometry.zobrist_hash(cells),
+            geometry.zobrist_hash(cells, mirrored=True),
+        )
+
 
 class SmartNPCPlayer(NPCPlayer):
     """Smart NPC that uses strategic heuristics"""
@@ -29,17 +141,44 @@ class SmartNPCPlayer(NPCPlayer):
         # Get difficulty settings from config
         self.settings = npc_config.get_difficulty_settings(difficulty)
         self.opponent_id = -self.player_id
+        # Our king's piece value and the bitboard property of the enemy pieces
+        is_p1 = self.player_id == Player.P1
+        self._king_type = P1_KING if is_p1 else P2_KING
+        self._enemy_occ = attrgetter("occ_p2" if is_p1 else "occ_p1")
+
+        # Bind the shared configuration values read while scoring moves (the
+        # difficulty settings stay on self.settings, which subclasses replace)
+        evaluation = npc_config.evaluation
+        king_safety = npc_config.king_safety
+        move_selection = npc_config.move_selection
+        self._center_control_weight = evaluation.center_control
+        self._chain_capture_bonus = evaluation.chain_capture_bonus
+        self._piece_protection_weight = evaluation.piece_protection
+        self._threat_creation_weight = evaluation.threat_creation
+        self._max_threat_value = evaluation.max_threat_value
+        self._threat_heuristics = evaluation.threat_heuristics
+        self._missing_king_penalty = king_safety.immediate_threat_penalty
+        self._king_capture_penalty = king_safety.capture_danger_penalty
+        self._very_safe_bonus = king_safety.very_safe_bonus
+        self._top_moves_count = move_selection.top_moves_count
+        self._selection_weights = move_selection.selection_weights
+        self._min_protection_value = move_selection.min_piece_value_for_protection
 
         # Cache for expensive calculations
-        self._threat_cache = {}
-
-        # Cache statistics
-        self._threat_cache_hits = 0
-        self._threat_cache_misses = 0
+        self._threat_cache: OrderedDict[tuple, int] = OrderedDict()
+        # Indices of the top moves by position and turn state; the weighted pick
+        # among them is made afresh each time
+        self._ranking_cache: OrderedDict[tuple, list[int]] = OrderedDict()
 
     def clear_cache(self):
         """Clear caches to prevent memory buildup between games"""
         self._threat_cache.clear()
+        self._ranking_cache.clear()
+
+    def reset_caches(self):
+        """Clear caches and cache statistics before reusing this player"""
+        super().reset_caches()
+        self.clear_cache()
 
     def get_move(self, game: DabloGame) -> Move | None:
         """
@@ -56,272 +195,464 @@ class SmartNPCPlayer(NPCPlayer):
         if random.random() < self.settings.randomness:
             return random.choice(valid_moves)
 
-        # Score all moves and sort them from best to worst
-        move_scores = [(move, self._evaluate_move(game, move)) for move in valid_moves]
-        move_scores.sort(key=lambda x: x[1], reverse=True)
-
-        # Select a subset of the best moves to introduce variety
-        top_count = npc_config.move_selection.top_moves_count
-        top_moves_with_scores = move_scores[:top_count]
-
-        if not top_moves_with_scores:
+        # Score all moves on a compact copy of the board and sort them from best
+        # to worst, unless this position was ranked before (on a revisit, such as
+        # after an undo or in a new game); the board hash and the turn state fix
+        # the list of valid moves the ranking indexes
+        geometry = game.geometry
+        cells = game.cells.copy()
+        board = EvalBoard.from_cells(cells, geometry)
+        cache_key = (
+            board.zobrist,
+            game.current_player,
+            game.capture_sequence,
+            game.capturing_piece,
+        )
+        ranking_cache = self._ranking_cache
+        ranking = ranking_cache.get(cache_key)
+        if ranking is not None:
+            ranking_cache.move_to_end(cache_key)
+        else:
+            ranking = self._rank_moves(game, cells, board, valid_moves)
+            ranking_cache[cache_key] = ranking
+            if len(ranking_cache) > RANKING_CACHE_SIZE:
+                ranking_cache.popitem(last=False)
+
+        if not ranking:
             # This case is unlikely if valid_moves is not empty, but it's safe to handle
             return valid_moves[0] if valid_moves else None
 
         # Perform a weighted random choice among the top moves
-        top_moves = [ms[0] for ms in top_moves_with_scores]
-        weights = npc_config.move_selection.selection_weights[: len(top_moves)]
+        top_moves = [valid_moves[i] for i in ranking]
+        weights = self._selection_weights[: len(top_moves)]
 
         # random.choices returns a list, so we select the first element
         return random.choices(top_moves, weights=weights, k=1)[0]
 
-    def _get_board_hash(self, board_state: dict) -> tuple:
-        """Create hashable representation of board state for caching"""
-        return tuple(sorted(board_state.items()))
+    def _rank_moves(
+        self,
+        game: DabloGame,
+        cells: np.ndarray,
+        board: EvalBoard,
+        valid_moves: list[Move],
+    ) -> list[int]:
+        """Indices of the top-scoring valid moves, best first"""
+        geometry = game.geometry
+        # The immediate terms are scored for all moves at once; only the terms
+        # that need the board after each move are evaluated move by move
+        move_cells = self._get_move_cells(valid_moves)
+        cheap_scores = self._score_immediate(geometry, cells, move_cells)
+
+        # Select a subset of the best moves to introduce variety
+        return self._rank_with_pruning(
+            geometry,
+            board,
+            valid_moves,
+            move_cells,
+            cheap_scores,
+            self._top_moves_count,
+        )
+
+    def _rank_with_pruning(
+        self,
+        geometry: BoardGeometry,
+        board: EvalBoard,
+        moves: list[Move],
+        move_cells: MoveCells,
+        cheap_scores: np.ndarray,
+        top_count: int,
+    ) -> list[int]:
+        """
+        Finds the indices of the top-scoring moves, best first.
+
+        Moves are evaluated from the highest upper bound down, keeping the best so
+        far in a min-heap of (score, -index), so equal scores rank by move order.
+        Once the heap is full, a move whose bound is below its worst entry cannot
+        displace it, and neither can any move after it.
+        """
+        upper_bounds = cheap_scores + self._bound_evaluation(
+            geometry, board, moves, move_cells
+        )
+
+        # Moves generated for the boards after each candidate, by (hash, player)
+        moves_cache: dict[tuple[int, int], list[Move]] = {}
+        best: list[tuple[float, int]] = []
+        for i in np.argsort(-upper_bounds, kind="stable").tolist():
+            if len(best) == top_count and upper_bounds[i] < best[0][0]:
+                break
+            score = cheap_scores[i] + self._evaluate_move(
+                geometry, board, moves[i], moves_cache
+            )
+            if len(best) < top_count:
+                heapq.heappush(best, (score, -i))
+            else:
+                heapq.heappushpop(best, (score, -i))
+        return [-neg_index for _, neg_index in sorted(best, reverse=True)]
+
+    @staticmethod
+    def _get_move_cells(moves: list[Move]) -> MoveCells:
+        """Get the cells of a move list as arrays aligned with ``moves``"""
+        return MoveCells(
+            np.fromiter((m.from_cell for m in moves), dtype=np.intp, count=len(moves)),
+            np.fromiter((m.to_cell for m in moves), dtype=np.intp, count=len(moves)),
+            np.fromiter(
+                (m.capture_cell if m.is_capture else -1 for m in moves),
+                dtype=np.intp,
+                count=len(moves),
+            ),
+        )
+
+    def _score_immediate(
+        self, geometry: BoardGeometry, cells: np.ndarray, move_cells: MoveCells
+    ) -> np.ndarray:
+        """
+        Scores the immediate impact of each move, as an array aligned with the moves.
+
+        Rewards the value of a captured piece and center control at the landing
+        square, vectorized over the move list.
+        """
+        # Non-captures index the last cell, and are masked out below
+        capture_cells = move_cells.capture
+        capture_values = np.where(
+            capture_cells >= 0, PIECE_VALUE_BY_RANK[np.abs(cells[capture_cells])], 0.0
+        )
+        center_bonuses = _center_bonus_by_cell(geometry.positions)[move_cells.to]
+        return (
+            capture_values * self.settings.capture_preference
+            + center_bonuses * self._center_control_weight
+        )
+
+    def _bound_evaluation(
+        self,
+        geometry: BoardGeometry,
+        board: EvalBoard,
+        moves: list[Move],
+        move_cells: MoveCells,
+    ) -> np.ndarray:
+        """
+        Bounds the score _evaluate_move can give each move from above.
+
+        Each term is replaced by its largest possible value and combined in the
+        same order as in _evaluate_move, so the bound holds exactly in floating
+        point too.
+        """
+        chain_bound = np.where(
+            move_cells.capture >= 0,
+            0.0 + self._chain_capture_bonus + PIECE_VALUE_BY_RANK.max(),
+            0.0,
+        )
+
+        bounds = chain_bound + MAX_KING_SAFETY_SCORE * self.settings.king_safety
+        if not self._threat_heuristics:
+            return bounds
+
+        # Moving a piece can at most remove all of the threats against it
+        protection_bounds = np.zeros(len(moves))
+        piece_values = PIECE_VALUE_BY_RANK[np.abs(board.cells[move_cells.from_])]
+        for i in np.flatnonzero(piece_values >= self._min_protection_value).tolist():
+            threat_before = self._get_threat_level(
+                geometry, board, moves[i].from_cell, self.player_id
+            )
+            protection_bounds[i] = threat_before * piece_values[i]
+
+        return (
+            bounds
+            + protection_bounds * self._piece_protection_weight
+            + self._max_threat_value * self._threat_creation_weight
+        )
 
-    def _evaluate_move(self, game: DabloGame, move: Move) -> float:
+    def _evaluate_move(
+        self,
+        geometry: BoardGeometry,
+        board: EvalBoard,
+        move: Move,
+        moves_cache: dict[tuple[int, int], list[Move]],
+    ) -> float:
         """
         Calculates a score for a given move based on multiple strategic heuristics.
 
         This is the core of the AI's decision-making process. It simulates the
         move once and passes the resulting state to various evaluation helpers.
+        The captured piece and center control terms are added separately, by
+        _score_immediate.
         """
         # Simulate the move once to get the resulting board state
-        board_after_move = self._simulate_move_on_board(game.board_state, move)
+        board_after_move = self._simulate_move_on_board(board, move, geometry)
 
-        # Score the move based on its immediate impact (e.g., captures)
         score = 0.0
         if move.is_capture:
-            captured_piece = game.board_state[move.capture_pos]
-            score += get_piece_value(captured_piece) * self.settings.capture_preference
-
-            # Check for potential chain captures after the first one
-            game_after_capture = self._create_temp_game_state(game, board_after_move)
-            next_moves = game_after_capture.get_valid_moves(move.to_pos)
-            chain_captures = [m for m in next_moves if m.is_capture]
+            # Check for potential chain captures after the first one. As in
+            # make_move, a chain may not jump back to the starting square.
+            next_moves = self._get_moves(
+                geometry, board_after_move, self.player_id, moves_cache
+            )
+            chain_captures = [
+                m
+                for m in next_moves
+                if m.is_capture
+                and m.from_cell == move.to_cell
+                and m.to_cell != move.from_cell
+            ]
 
             if chain_captures:
-                score += npc_config.evaluation.chain_capture_bonus
+                score += self._chain_capture_bonus
                 # Add the value of the best subsequent capture to the score
+                cells_after = board_after_move.cells
                 best_follow_up_value = max(
-                    get_piece_value(
-                        game_after_capture.board_state.get(c.capture_pos, EMPTY)
-                    )
-                    for c in chain_captures
+                    PIECE_VALUES[cells_after[c.capture_cell]] for c in chain_captures
                 )
                 score += best_follow_up_value
 
         # Add scores from various strategic heuristics
         score += (
-            self._evaluate_king_safety(game, move, board_after_move)
+            self._evaluate_king_safety(geometry, board_after_move)
             * self.settings.king_safety
         )
+        if not self._threat_heuristics:
+            return score
+
         score += (
-            self._evaluate_center_control(move) * npc_config.evaluation.center_control
-        )
-        score += (
-            self._evaluate_piece_protection(game, move, board_after_move)
-            * npc_config.evaluation.piece_protection
+            self._evaluate_piece_protection(geometry, move, board, board_after_move)
+            * self._piece_protection_weight
         )
         score += (
-            self._evaluate_threat_creation(game, board_after_move)
-            * npc_config.evaluation.threat_creation
+            self._evaluate_threat_creation(geometry, board_after_move, moves_cache)
+            * self._threat_creation_weight
         )
 
         return score
 
     def _evaluate_king_safety(
-        self, game: DabloGame, move: Move, board_after_move: dict
+        self, geometry: BoardGeometry, board_after_move: EvalBoard
     ) -> float:
         """Evaluate how this move affects king safety"""
-        # Find our king position
-        king_type = P1_KING if self.player_id == Player.P1 else P2_KING
+        positions = geometry.positions
+        bitboards = board_after_move.bitboards
 
         # Find the king's position on the new board
-        king_pos = None
-        for pos, piece in board_after_move.items():
-            if piece == king_type:
-                king_pos = pos
-                break
-
-        if not king_pos:
+        king_bb = bitboards.pieces[self._king_type]
+        if not king_bb:
             # This would mean the king was captured, which is a game-losing move
-            return npc_config.king_safety.immediate_threat_penalty
+            return self._missing_king_penalty
 
-        # Create a temporary game state to check the opponent's reply
-        temp_game = self._create_temp_game_state(
-            game, board_after_move, player_to_move=self.opponent_id
-        )
+        king_cell = king_bb.bit_length() - 1
 
-        # Check for immediate capture threats to the king
-        for opp_move in temp_game.get_all_valid_moves():
-            if opp_move.is_capture and opp_move.capture_pos == king_pos:
-                return npc_config.king_safety.capture_danger_penalty
+        # Check for immediate capture threats to the king (the opponent's reply)
+        if self._threat_heuristics and self._count_capture_threats(
+            geometry, board_after_move, king_cell, self.player_id
+        ):
+            return self._king_capture_penalty
 
         # Evaluate king safety based on distance to the nearest enemy piece ---
-        kr, kc = king_pos
-
-        enemy_positions = [
-            (((kr - r) ** 2 + (kc - c) ** 2) ** 0.5)
-            for (r, c), piece in board_after_move.items()
-            if piece != EMPTY and (piece.value > 0) != (self.player_id.value > 0)
-        ]
+        enemy_bb = self._enemy_occ(bitboards)
 
         # If no enemies left, king is very safe
-        if not enemy_positions:
-            return npc_config.king_safety.very_safe_bonus
-
-        min_dist = min(enemy_positions)
-
-        thresholds = [
-            (
-                npc_config.king_safety.immediate_danger_threshold,
-                npc_config.king_safety.close_distance_penalty,
-            ),
-            (
-                npc_config.king_safety.close_danger_threshold,
-                npc_config.king_safety.medium_distance_penalty,
-            ),
-            (
-                npc_config.king_safety.medium_safety_threshold,
-                npc_config.king_safety.safe_distance_bonus,
-            ),
-        ]
-        for threshold, score in thresholds:
-            if min_dist < threshold:
+        if not enemy_bb:
+            return self._very_safe_bonus
+
+        # The nearest enemy falls in the first distance band that holds any
+        for band_mask, (_, score) in zip(
+            _king_distance_masks(positions)[king_cell],
+            KING_DISTANCE_SCORES,
+            strict=True,
+        ):
+            if enemy_bb & band_mask:
                 return score
 
-        return npc_config.king_safety.very_safe_bonus
-
-    def _evaluate_center_control(self, move: Move) -> float:
-        """Rewards moves that place pieces in the center of the board."""
-        to_r, to_c = move.to_pos
-        bonus = 0.0
-        if to_r in npc_config.center_control.center_rows:
-            bonus += npc_config.center_control.row_bonus
-        if to_c in npc_config.center_control.center_cols:
-            bonus += npc_config.center_control.col_bonus
-        return bonus
+        return self._very_safe_bonus
 
     def _evaluate_piece_protection(
-        self, game: DabloGame, move: Move, board_after_move: dict
+        self,
+        geometry: BoardGeometry,
+        move: Move,
+        board: EvalBoard,
+        board_after_move: EvalBoard,
     ) -> float:
         """Rewards moves that reduce threats to valuable pieces."""
-        moving_piece = game.board_state.get(move.from_pos)
-        if not moving_piece:
-            return 0.0
-
-        piece_value = get_piece_value(moving_piece)
-        if piece_value < npc_config.move_selection.min_piece_value_for_protection:
+        piece_value = PIECE_VALUES[board.cells[move.from_cell]]
+        if piece_value < self._min_protection_value:
             return 0.0  # Only evaluate for more valuable pieces (e.g., Princes, Kings)
 
         # To evaluate threat reduction, we check threats before and after the move.
-        threat_before = self._get_threat_level(game, move.from_pos, self.player_id)
+        threat_before = self._get_threat_level(
+            geometry, board, move.from_cell, self.player_id
+        )
         if threat_before == 0:
             return 0.0  # Piece was not threatened, so no bonus for moving it.
 
-        game_after_move = self._create_temp_game_state(game, board_after_move)
         threat_after = self._get_threat_level(
-            game_after_move, move.to_pos, self.player_id
+            geometry, board_after_move, move.to_cell, self.player_id
         )
 
         threat_reduction = threat_before - threat_after
         return threat_reduction * piece_value  # Saving a King is worth more
 
     def _get_threat_level(
-        self, game: DabloGame, pos: tuple[int, int], for_player_id: Player
+        self,
+        geometry: BoardGeometry,
+        board: EvalBoard,
+        cell: int,
+        for_player_id: Player,
     ) -> int:
         """
-        Counts how many opponent pieces can capture a given position.
+        Counts how many opponent pieces can capture a given cell.
 
         This is a simplified threat analysis. A full analysis would require a deeper search.
+        Threats are read from the board geometry's move tables and the bitboards,
+        without generating the opponent's moves.
         """
-        # Check cache first
-        board_hash = self._get_board_hash(game.board_state)
-        cache_key = (board_hash, pos, for_player_id)
-        if cache_key in self._threat_cache:
+        # Check cache first. The threat level is unchanged by mirroring the board,
+        # so a board and its mirror image share entries: the key takes the smaller
+        # of the two hashes, with the cell mirrored along with the board.
+        threat_cache = self._threat_cache
+        if board.mirror_zobrist < board.zobrist:
+            cache_key = (board.mirror_zobrist, geometry.mirror[cell], for_player_id)
+        else:
+            cache_key = (board.zobrist, cell, for_player_id)
+        if cache_key in threat_cache:
             self._threat_cache_hits += 1
-            return self._threat_cache[cache_key]
+            threat_cache.move_to_end(cache_key)
+            return threat_cache[cache_key]
 
         self._threat_cache_misses += 1
-        temp_game = self._create_temp_game_state(
-            game, game.board_state, player_to_move=-for_player_id
-        )
+        bitboards = board.bitboards
+        opponent_id = -for_player_id
 
-        # Count immediate capture threats
-        immediate_threats = sum(
-            1
-            for mv in temp_game.get_all_valid_moves()
-            if mv.is_capture and mv.capture_pos == pos
+        immediate_threats = self._count_capture_threats(
+            geometry, board, cell, for_player_id
         )
         if immediate_threats > 0:
             return immediate_threats
 
-        # Approximate potential threats by checking if an opponent can move adjacent
-        r_pos, c_pos = pos
+        # Approximate potential threats by counting the opponent moves onto an
+        # empty square adjacent to the target: for each such square, the opponent
+        # pieces on cells a regular move reaches it from
+        targets = geometry.adj_masks[cell] & bitboards.pieces[EMPTY]
+        forward_sources = geometry.forward_sources[opponent_id]
+        opponent_bb = bitboards.occ_p1 if opponent_id == Player.P1 else bitboards.occ_p2
         potential_threats = 0
-        for move in temp_game.get_all_valid_moves():
-            if not move.is_capture:
-                r_to, c_to = move.to_pos
-                # Check if the move lands on a square adjacent to the target position
-                if abs(r_to - r_pos) <= 1 and abs(c_to - c_pos) <= 1:
-                    potential_threats += 1
+        while targets:
+            lsb = targets & -targets
+            potential_threats += (
+                forward_sources[lsb.bit_length() - 1] & opponent_bb
+            ).bit_count()
+            targets ^= lsb
 
         # Cache and return result
         result = immediate_threats if immediate_threats > 0 else potential_threats
-        self._threat_cache[cache_key] = result
+        threat_cache[cache_key] = result
+        if len(threat_cache) > THREAT_CACHE_SIZE:
+            threat_cache.popitem(last=False)
         return result
 
     def _evaluate_threat_creation(
-        self, game: DabloGame, board_after_move: dict
+        self,
+        geometry: BoardGeometry,
+        board_after_move: EvalBoard,
+        moves_cache: dict[tuple[int, int], list[Move]],
     ) -> float:
         """Rewards moves that create new capture threats against the opponent."""
-        temp_game = self._create_temp_game_state(
-            game, board_after_move, player_to_move=self.player_id
-        )
-
-        # Find all capture moves we can make from the new state
-        capture_moves = [m for m in temp_game.get_all_valid_moves() if m.is_capture]
-
-        threat_value = sum(
-            get_piece_value(temp_game.board_state.get(m.capture_pos, EMPTY))
-            for m in capture_moves
-        )
-
-        # Apply a multiplier and a cap to keep the value in a reasonable range
-        return min(threat_value * 0.3, npc_config.evaluation.max_threat_value)
+        # Sum the values of the pieces we can capture from the new state. A
+        # multiplier and a cap keep the result in a reasonable range; the sum only
+        # grows, so stop as soon as it reaches the cap.
+        max_threat_value = self._max_threat_value
+        cells = board_after_move.cells
+        threat_value = 0
+        for m in self._get_moves(
+            geometry, board_after_move, self.player_id, moves_cache
+        ):
+            if m.is_capture:
+                threat_value += PIECE_VALUES[cells[m.capture_cell]]
+                if threat_value * 0.3 >= max_threat_value:
+                    return max_threat_value
+
+        return threat_value * 0.3
 
     @staticmethod
-    def _simulate_move_on_board(board_state: dict, move: Move) -> dict:
+    def _simulate_move_on_board(
+        board: EvalBoard, move: Move, geometry: BoardGeometry
+    ) -> EvalBoard:
         """
-        Applies a move to a board state dictionary and returns the new state.
+        Applies a move to an evaluation board and returns the new board.
         This is a lightweight, pure function that avoids object mutation.
         """
-        new_board = board_state.copy()
-        moving_piece = new_board.pop(move.from_pos, EMPTY)
-        new_board[move.to_pos] = moving_piece
+        zobrist = geometry.zobrist
+        mirror_zobrist = geometry.mirror_zobrist
+        cells = board.cells.copy()
+        from_cell = move.from_cell
+        to_cell = move.to_cell
+        moving_piece = int(cells[from_cell])
+        cells[to_cell] = moving_piece
+        cells[from_cell] = EMPTY
+        # Update the hashes incrementally: XOR the piece out of its old cell and in
+        # to its new one (and the captured piece out)
+        board_hash = (
+            board.zobrist
+            ^ zobrist[moving_piece][from_cell]
+            ^ zobrist[moving_piece][to_cell]
+        )
+        mirror_hash = (
+            board.mirror_zobrist
+            ^ mirror_zobrist[moving_piece][from_cell]
+            ^ mirror_zobrist[moving_piece][to_cell]
+        )
 
-        if move.is_capture and move.capture_pos:
-            new_board[move.capture_pos] = EMPTY
+        captured_piece = EMPTY
+        capture_cell = 0
+        if move.is_capture:
+            capture_cell = move.capture_cell
+            captured_piece = int(cells[capture_cell])
+            cells[capture_cell] = EMPTY
+            board_hash ^= zobrist[captured_piece][capture_cell]
+            mirror_hash ^= mirror_zobrist[captured_piece][capture_cell]
+
+        bitboards = board.bitboards.moved(
+            moving_piece, from_cell, to_cell, captured_piece, capture_cell
+        )
+        return EvalBoard(cells, bitboards, board_hash, mirror_hash)
 
-        return new_board
+    @staticmethod
+    def _get_moves(
+        geometry: BoardGeometry,
+        board: EvalBoard,
+        player_id: Player,
+        moves_cache: dict[tuple[int, int], list[Move]],
+    ) -> list[Move]:
+        """Generate a player's moves on an evaluation board, memoized by its hash"""
+        cache_key = (board.zobrist, player_id)
+        moves = moves_cache.get(cache_key)
+        if moves is None:
+            moves = generate_moves(board.cells, player_id, geometry)
+            moves_cache[cache_key] = moves
+        return moves
 
-    def _create_temp_game_state(
-        self,
-        original_game: DabloGame,
-        board_state: dict,
-        player_to_move: Player | None = None,
-    ) -> DabloGame:
+    @staticmethod
+    def _count_capture_threats(
+        geometry: BoardGeometry, board: EvalBoard, cell: int, for_player_id: Player
+    ) -> int:
         """
-        Creates a temporary, lightweight DabloGame instance for analysis.
+        Counts the opponent captures of a player's piece on a cell.
+
+        Reads the precomputed attack table: opponent pieces of at least the target's
+        rank on a neighbouring cell, with an empty landing square on the far side.
         """
-        temp_game = DabloGame(config=original_game.config, initial_state="empty")
-        temp_game.board_state = board_state.copy()
-        # If a player is specified, set them as the current player. Otherwise, use the original.
-        temp_game.current_player = (
-            player_to_move if player_to_move is not None else self.player_id
-        )
-        return temp_game
+        target = int(board.cells[cell])
+        if target * for_player_id <= 0:
+            return 0
+
+        pieces = board.bitboards.pieces
+        capable = 0
+        for rank in range(abs(target), P1_KING + 1):
+            capable |= pieces[rank * -for_player_id]
+        if not geometry.attacker_masks[cell] & capable:
+            return 0
+
+        empty = pieces[EMPTY]
+        threats = 0
+        for attacker, landing in geometry.attackers[cell]:
+            if capable >> attacker & 1 and empty >> landing & 1:
+                threats += 1
+        return threats
 
 
 class RandomNPCPlayer(NPCPlayer):
@@ -0,0 +1,298 @@
+"""
+Board geometry for Dablo
+
+Numbers the graph-based board's (row, col) positions as dense integer cells, so a
+board state can be held in a compact int8 array instead of a position-keyed dict,
+and sets of cells in a single int bitmask (bit i set = cell i).
+"""
+
+from dataclasses import dataclass
+from functools import cache
+import random
+
+import numpy as np
+
+from .pieces import PieceType
+from .player import Player
+from .rules import MovementValidator
+
+
+# PieceType by numeric value; negative values index from the end of the tuple
+_PIECE_BY_VALUE: tuple[PieceType, ...] = tuple(
+    PieceType(value) for value in (0, 1, 2, 3, -3, -2, -1)
+)
+
+# Neighbour offsets (row, col) of the primary (integer) and secondary (half-step)
+# nodes, in the order the board graph lists neighbours
+_PRIMARY_OFFSETS = (
+    (-1.0, 0.0),
+    (1.0, 0.0),
+    (0.0, -1.0),
+    (0.0, 1.0),
+    (-0.5, -0.5),
+    (-0.5, 0.5),
+    (0.5, -0.5),
+    (0.5, 0.5),
+)
+_SECONDARY_OFFSETS = ((-0.5, -0.5), (-0.5, 0.5), (0.5, -0.5), (0.5, 0.5))
+
+# Fixed seed so Zobrist hashes agree between processes and runs
+_ZOBRIST_SEED = 0xDAB10
+
+
+@dataclass(frozen=True, slots=True)
+class BoardGeometry:
+    """Cell numbering for one board size, with positions in sorted (row, col) order"""
+
+    positions: tuple[tuple[float, float], ...]
+    cell_index: dict[tuple[float, float], int]
+    # Board graph neighbours of each cell
+    neighbors: tuple[tuple[int, ...], ...]
+    # Neighbours each cell can make a regular (forward) move to, by player, and
+    # the reverse: bitmask of the cells a regular move can reach each cell from
+    forward_neighbors: dict[Player, tuple[tuple[int, ...], ...]]
+    forward_sources: dict[Player, tuple[int, ...]]
+    # Landing cell of a capture by a piece on one cell over another, indexed
+    # [from cell][captured cell]; -1 where the cells are not neighbours or the
+    # landing square is off the board
+    landing: tuple[tuple[int, ...], ...]
+    # Per player, the (neighbour, is forward, landing cell) step of each cell's
+    # neighbours in board graph order: a regular move needs a forward step to an
+    # empty neighbour, a capture jumps the neighbour onto the landing cell
+    steps: dict[Player, tuple[tuple[tuple[int, bool, int], ...], ...]]
+    # (attacker cell, landing cell) pairs from which a piece on each cell can be
+    # captured, and the bitmask of those attacker cells
+    attackers: tuple[tuple[tuple[int, int], ...], ...]
+    attacker_masks: tuple[int, ...]
+    # Bitmask of the cells at most one row and one column away from each cell
+    adj_masks: tuple[int, ...]
+    # Random 64-bit Zobrist key per piece value (indexed like _PIECE_BY_VALUE) and
+    # cell; the EMPTY keys are all zero, so only pieces contribute to a hash
+    zobrist: tuple[tuple[int, ...], ...]
+    # Each cell's left-right mirror image (column c <-> board_cols - 1 - c), and
+    # the Zobrist keys of the mirrored cells, which hash a board's mirror image
+    mirror: tuple[int, ...]
+    mirror_zobrist: tuple[tuple[int, ...], ...]
+
+    def encode(self, board_state: dict[tuple[float, float], PieceType]) -> np.ndarray:
+        """Convert a board state dict into an int8 array of piece values by cell"""
+        return np.fromiter(
+            (board_state.get(pos, 0) for pos in self.positions),
+            dtype=np.int8,
+            count=len(self.positions),
+        )
+
+    def zobrist_hash(self, cells: np.ndarray, mirrored: bool = False) -> int:
+        """
+        Hash an int8 cell array by XOR-ing the Zobrist keys of its pieces, or with
+        ``mirrored`` the hash of its left-right mirror image
+        """
+        zobrist = self.mirror_zobrist if mirrored else self.zobrist
+        board_hash = 0
+        for cell, value in enumerate(cells.tolist()):
+            board_hash ^= zobrist[value][cell]
+        return board_hash
+
+    def decode(self, cells: np.ndarray) -> dict[tuple[float, float], PieceType]:
+        """Convert an int8 cell array back into a board state dict"""
+        return dict(
+            zip(
+                self.positions,
+                map(_PIECE_BY_VALUE.__getitem__, cells.tolist()),
+                strict=True,
+            )
+        )
+
+    def board_graph(self) -> dict[tuple[float, float], list[tuple[float, float]]]:
+        """Build a fresh position-keyed board graph (see build_board_graph)"""
+        positions = self.positions
+        return {
+            pos: [positions[n] for n in neighbors]
+            for pos, neighbors in zip(positions, self.neighbors, strict=True)
+        }
+
+
+@dataclass(frozen=True, slots=True)
+class BitBoards:
+    """Piece placement as one cell bitmask per piece type"""
+
+    # Bitmask per piece value, indexed like _PIECE_BY_VALUE; [EMPTY] marks empty cells
+    pieces: tuple[int, ...]
+
+    @classmethod
+    def from_cells(cls, cells: np.ndarray) -> "BitBoards":
+        """Build the bitboards for an int8 cell array"""
+        pieces = [0] * len(_PIECE_BY_VALUE)
+        for cell, value in enumerate(cells.tolist()):
+            pieces[value] |= 1 << cell
+        return cls(tuple(pieces))
+
+    @property
+    def occ_p1(self) -> int:
+        """Cells occupied by Player 1"""
+        pieces = self.pieces
+        return (
+            pieces[PieceType.P1_WARRIOR]
+            | pieces[PieceType.P1_PRINCE]
+            | pieces[PieceType.P1_KING]
+        )
+
+    @property
+    def occ_p2(self) -> int:
+        """Cells occupied by Player 2"""
+        pieces = self.pieces
+        return (
+            pieces[PieceType.P2_WARRIOR]
+            | pieces[PieceType.P2_PRINCE]
+            | pieces[PieceType.P2_KING]
+        )
+
+    def moved(
+        self,
+        piece: int,
+        from_cell: int,
+        to_cell: int,
+        captured: int = PieceType.EMPTY,
+        capture_cell: int = 0,
+    ) -> "BitBoards":
+        """Return the bitboards after moving a piece (and removing a captured one)"""
+        pieces = list(self.pieces)
+        move_bits = (1 << from_cell) | (1 << to_cell)
+        pieces[piece] ^= move_bits
+        pieces[PieceType.EMPTY] ^= move_bits
+        if captured:
+            capture_bit = 1 << capture_cell
+            pieces[captured] ^= capture_bit
+            pieces[PieceType.EMPTY] ^= capture_bit
+        return BitBoards(tuple(pieces))
+
+
+def build_board_graph(
+    board_rows: int, board_cols: int
+) -> dict[tuple[float, float], list[tuple[float, float]]]:
+    """Creates the board graph using tuple coordinates."""
+    all_nodes: set[tuple[float, float]] = set()
+
+    for r_int in range(board_rows):
+        for c_int in range(board_cols):
+            r, c = float(r_int), float(c_int)
+            all_nodes.add((r, c))
+            if r_int < board_rows - 1 and c_int < board_cols - 1:
+                all_nodes.add((r + 0.5, c + 0.5))
+
+    graph: dict[tuple[float, float], list[tuple[float, float]]] = {}
+    for r, c in all_nodes:
+        is_primary = r == int(r) and c == int(c)
+        graph[r, c] = [
+            neighbor
+            for dr, dc in (_PRIMARY_OFFSETS if is_primary else _SECONDARY_OFFSETS)
+            if (neighbor := (r + dr, c + dc)) in all_nodes
+        ]
+
+    return graph
+
+
+@cache
+def get_board_geometry(board_rows: int, board_cols: int) -> BoardGeometry:
+    """Build (once per board size) the cell numbering and lookup tables for a board"""
+    graph = build_board_graph(board_rows, board_cols)
+    positions = sorted(graph)
+    cell_index = {pos: cell for cell, pos in enumerate(positions)}
+
+    neighbors = tuple(tuple(cell_index[n] for n in graph[pos]) for pos in positions)
+
+    forward_neighbors = {
+        player: tuple(
+            tuple(
+                n
+                for n in neighbors[cell]
+                if MovementValidator.is_forward_move(
+                    positions[cell], positions[n], player > 0
+                )
+            )
+            for cell in range(len(positions))
+        )
+        for player in Player
+    }
+
+    forward_sources = {
+        player: tuple(
+            sum(
+                1 << source
+                for source in range(len(positions))
+                if cell in forward_neighbors[player][source]
+            )
+            for cell in range(len(positions))
+        )
+        for player in Player
+    }
+
+    # A piece is captured by jumping over it from a neighbouring cell; the jump
+    # is only possible where the landing square is on the board
+    landing = [[-1] * len(positions) for _ in positions]
+    for cell, pos in enumerate(positions):
+        for n in neighbors[cell]:
+            landing_pos = MovementValidator.calculate_capture_landing(pos, positions[n])
+            landing[cell][n] = cell_index.get(landing_pos, -1)
+
+    steps = {
+        player: tuple(
+            tuple(
+                (n, n in forward_neighbors[player][cell], landing[cell][n])
+                for n in neighbors[cell]
+            )
+            for cell in range(len(positions))
+        )
+        for player in Player
+    }
+
+    attackers = [
+        tuple(
+            (attacker, landing[attacker][target])
+            for attacker in neighbors[target]
+            if landing[attacker][target] >= 0
+        )
+        for target in range(len(positions))
+    ]
+
+    adj_masks = tuple(
+        sum(
+            1 << other
+            for other, (r2, c2) in enumerate(positions)
+            if other != cell and abs(r2 - r) <= 1 and abs(c2 - c) <= 1
+        )
+        for cell, (r, c) in enumerate(positions)
+    )
+
+    rng = random.Random(_ZOBRIST_SEED)
+    zobrist = tuple(
+        (0,) * len(positions)
+        if piece == PieceType.EMPTY
+        else tuple(rng.getrandbits(64) for _ in positions)
+        for piece in _PIECE_BY_VALUE
+    )
+
+    # Mirroring the columns maps the primary and secondary nodes onto each other
+    # and keeps every row, so it preserves the graph, forward moves and captures
+    mirror = tuple(cell_index[(r, board_cols - 1 - c)] for r, c in positions)
+    mirror_zobrist = tuple(
+        tuple(keys[mirror_cell] for mirror_cell in mirror) for keys in zobrist
+    )
+
+    return BoardGeometry(
+        positions=tuple(positions),
+        cell_index=cell_index,
+        neighbors=neighbors,
+        forward_neighbors=forward_neighbors,
+        forward_sources=forward_sources,
+        landing=tuple(map(tuple, landing)),
+        steps=steps,
+        attackers=tuple(attackers),
+        attacker_masks=tuple(
+            sum(1 << attacker for attacker, _ in pairs) for pairs in attackers
+        ),
+        adj_masks=adj_masks,
+        zobrist=zobrist,
+        mirror=mirror,
+        mirror_zobrist=mirror_zobrist,
+    )
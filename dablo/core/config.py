@@ -4,12 +4,27 @@ Configuration settings for Dablo game using Pydantic models.
 Contains all game rules, board setup, and game parameters with validation.
 """
 
+from dataclasses import dataclass
+
 from pydantic import BaseModel, Field, computed_field
 
 from .pieces import PieceType
 
 
-class DabloConfig(BaseModel):
+@dataclass(frozen=True, slots=True)
+class DabloConfigCore:
+    """Plain copy of a validated DabloConfig, for reads on the game's hot paths"""
+
+    board_rows: int
+    board_cols: int
+    move_limit: int
+    p1_setup: dict[PieceType, list[tuple[float, float]]]
+    p2_setup: dict[PieceType, list[tuple[float, float]]]
+    # Every (position, piece) of both setups, in setup order (P1 first)
+    initial_layout: tuple[tuple[tuple[float, float], PieceType], ...]
+
+
+class DabloConfig(BaseModel, frozen=True, defer_build=True):
     """Configuration for core game mechanics and rules with validation."""
 
     board_rows: int = Field(
@@ -46,6 +61,27 @@ class DabloConfig(BaseModel):
         description="Initial setup positions for Player 2 pieces",
     )
 
+    @property
+    def core(self) -> DabloConfigCore:
+        """
+        The settings as a slotted dataclass, built on each access (a game keeps the
+        one it reads). Not cached, since model_copy would carry a cached copy over
+        unchanged.
+        """
+        return DabloConfigCore(
+            board_rows=self.board_rows,
+            board_cols=self.board_cols,
+            move_limit=self.move_limit,
+            p1_setup=self.p1_setup,
+            p2_setup=self.p2_setup,
+            initial_layout=tuple(
+                (pos, piece_type)
+                for setup in (self.p1_setup, self.p2_setup)
+                for piece_type, positions in setup.items()
+                for pos in positions
+            ),
+        )
+
     @computed_field
     @property
     def board_size(self) -> tuple[int, int]:
@@ -4,13 +4,94 @@ Core Dablo game logic
 Contains the main game state, board management, and move execution.
 """
 
+from collections.abc import Iterator
+from functools import cache
+from itertools import groupby, islice
+from operator import itemgetter
 import random
 from typing import Any
 
+import numpy as np
+
+from .board import BoardGeometry, get_board_geometry
 from .config import DabloConfig
-from .pieces import PieceType, get_piece_symbol
+from .pieces import CAN_CAPTURE, PieceType, get_piece_symbol
 from .player import Player
-from .rules import GameRules, Move, MovementValidator
+from .rules import GameRules, Move
+from .utils import GameUtils
+
+
+def generate_moves(
+    cells: np.ndarray,
+    player: Player,
+    geometry: BoardGeometry,
+    from_cell: int | None = None,
+) -> list[Move]:
+    """
+    Generate the valid moves for a player on an int8 cell board (see BoardGeometry).
+
+    This is a pure function of the board, so boards can be analysed without building
+    a DabloGame. Pass ``from_cell`` to only generate the moves of the piece there.
+    The moves carry their cell indices alongside the positions.
+    """
+    return list(iter_moves(cells, player, geometry, from_cell))
+
+
+def iter_moves(
+    cells: np.ndarray,
+    player: Player,
+    geometry: BoardGeometry,
+    from_cell: int | None = None,
+) -> Iterator[Move]:
+    """Yield the moves of generate_moves one by one, for callers that stop early"""
+    board = cells.tolist()
+    positions = geometry.positions
+    steps = geometry.steps[player]
+    sources = range(len(board)) if from_cell is None else (from_cell,)
+
+    for cell in sources:
+        piece = board[cell]
+        if piece * player <= 0:
+            continue
+
+        from_pos = positions[cell]
+        captures = CAN_CAPTURE[piece]
+        for neighbor, forward, landing in steps[cell]:
+            target = board[neighbor]
+
+            # Regular move to empty position (EMPTY is 0, so the raw cell values
+            # are tested for emptiness directly)
+            if not target:
+                if forward:
+                    yield Move(
+                        from_pos=from_pos,
+                        to_pos=positions[neighbor],
+                        from_cell=cell,
+                        to_cell=neighbor,
+                    )
+
+            # Capture move: jump an opponent piece of equal or lower rank (see
+            # can_capture) onto an empty landing position
+            elif landing >= 0 and captures[target] and not board[landing]:
+                yield Move(
+                    from_pos=from_pos,
+                    to_pos=positions[landing],
+                    capture_pos=positions[neighbor],
+                    from_cell=cell,
+                    to_cell=landing,
+                    capture_cell=neighbor,
+                )
+
+
+@cache
+def _get_render_rows(
+    positions: tuple[tuple[float, float], ...],
+) -> tuple[tuple[float, tuple[tuple[float, float], ...]], ...]:
+    """Group sorted board positions into (row, positions in column order) rows"""
+    return tuple(
+        (r, tuple(row_positions))
+        for r, row_positions in groupby(positions, key=itemgetter(0))
+    )
 
 
 class DabloGame:
@@ -20,12 +101,21 @@ class DabloGame:
         self, config: DabloConfig | None = None, initial_state: str = "default"
     ):
         self.config = config or DabloConfig.create_default()
-
+        # Game logic reads the settings through the dataclass copy
+        self.core = self.config.core
+        self.geometry = get_board_geometry(self.core.board_rows, self.core.board_cols)
+
+        # The board is held as an int8 array of piece values by cell (see
+        # BoardGeometry) with a bitmask of each player's cells, which the move
+        # generation reads; board_state mirrors it as a position-keyed dict. The
+        # array is allocated once and updated in place for the lifetime of the game
+        self.cells = np.zeros(len(self.geometry.positions), dtype=np.int8)
         self.board_state: dict[tuple[float, float], PieceType] = {}
         self.nodes: dict[tuple[float, float], list[tuple[float, float]]] = (
             self._create_board_graph()
         )
-        self.positions: list[tuple[float, float]] = sorted(self.nodes.keys())
+        # The geometry's positions are already sorted
+        self.positions: list[tuple[float, float]] = list(self.geometry.positions)
 
         self.current_player = Player.P1
         self.game_over = False
@@ -39,73 +129,140 @@ class DabloGame:
         # For reward calculation
         self.initial_piece_counts = None
 
-        self.p1_pieces: set[tuple[float, float]] = set()
-        self.p2_pieces: set[tuple[float, float]] = set()
+        # Snapshot of the initial position, taken by the first reset()
+        self._initial_position = None
 
         if not initial_state == "empty":
             self._setup_initial_pieces()
 
+    @property
+    def board_state(self) -> dict[tuple[float, float], PieceType]:
+        """
+        The board as a dict of the piece at each position. The cells and bitboards
+        are derived from it only by the setter, so change the board through
+        add_piece, remove_piece, setup_custom_position or by assigning a dict, not
+        by writing to this one in place.
+        """
+        return self._board_state
+
+    @board_state.setter
+    def board_state(self, board_state: dict[tuple[float, float], PieceType]):
+        """Replace the board, re-deriving the cells and bitboards from the dict"""
+        self._board_state = board_state
+        self._valid_moves = None
+        # The cached moves grouped by origin, with the list they were grouped from
+        self._moves_by_from: tuple[list[Move], dict] | None = None
+        # Filled in place, so views of the cells array stay valid
+        self.cells[:] = self.geometry.encode(board_state)
+        # Bitmask of each piece type's cells, indexed by piece value (negative
+        # values index from the end; the EMPTY entry stays unused)
+        self.piece_bb = [0] * len(PieceType)
+        self.p1_bb = 0
+        self.p2_bb = 0
+        for cell, value in enumerate(self.cells.tolist()):
+            self.piece_bb[value] |= 1 << cell
+            if value > 0:
+                self.p1_bb |= 1 << cell
+            elif value < 0:
+                self.p2_bb |= 1 << cell
+        self.piece_bb[PieceType.EMPTY] = 0
+
+    @property
+    def cells_view(self) -> np.ndarray:
+        """
+        Read-only view of the board's int8 cell array, which follows the game as it
+        is played and reset, so observations need no copy
+        """
+        # Made per call rather than stored, so copies and unpickled games get a
+        # view of their own cells
+        view = self.cells.view()
+        view.flags.writeable = False
+        return view
+
+    def get_occupancy(self) -> np.ndarray:
+        """Get the Player 1 and Player 2 occupancy bitboards as a uint64 array"""
+        return np.array((self.p1_bb, self.p2_bb), dtype=np.uint64)
+
+    @property
+    def p1_pieces(self) -> set[tuple[float, float]]:
+        """Positions of Player 1's pieces, as a new set (changing it has no effect)"""
+        return self._positions_of(self.p1_bb)
+
+    @property
+    def p2_pieces(self) -> set[tuple[float, float]]:
+        """Positions of Player 2's pieces, as a new set (changing it has no effect)"""
+        return self._positions_of(self.p2_bb)
+
+    def _positions_of(self, bitboard: int) -> set[tuple[float, float]]:
+        """Positions of the cells set in a bitboard"""
+        positions = self.geometry.positions
+        result = set()
+        while bitboard:
+            lsb = bitboard & -bitboard
+            result.add(positions[lsb.bit_length() - 1])
+            bitboard ^= lsb
+        return result
+
     def _create_board_graph(
         self,
     ) -> dict[tuple[float, float], list[tuple[float, float]]]:
         """Creates the board graph using tuple coordinates."""
-        all_nodes: set[tuple[float, float]] = set()
-        rows, cols = self.config.board_rows, self.config.board_cols
-
-        for r_int in range(rows):
-            for c_int in range(cols):
-                r, c = float(r_int), float(c_int)
-                all_nodes.add((r, c))
-                if r_int < rows - 1 and c_int < cols - 1:
-                    all_nodes.add((r + 0.5, c + 0.5))
-
-        graph: dict[tuple[float, float], list[tuple[float, float]]] = {
-            pos: [] for pos in all_nodes
-        }
+        # Built from the cached geometry rather than from scratch for every game
+        return self.geometry.board_graph()
 
-        for r, c in all_nodes:
-            current_pos = (r, c)
-            if r == int(r) and c == int(c):  # Primary Node
-                potential_neighbors = [
-                    (r - 1.0, c),
-                    (r + 1.0, c),
-                    (r, c - 1.0),
-                    (r, c + 1.0),
-                    (r - 0.5, c - 0.5),
-                    (r - 0.5, c + 0.5),
-                    (r + 0.5, c - 0.5),
-                    (r + 0.5, c + 0.5),
-                ]
-            else:  # Secondary Node
-                potential_neighbors = [
-                    (r - 0.5, c - 0.5),
-                    (r - 0.5, c + 0.5),
-                    (r + 0.5, c - 0.5),
-                    (r + 0.5, c + 0.5),
-                ]
-
-            for neighbor in potential_neighbors:
-                if neighbor in all_nodes:
-                    graph[current_pos].append(neighbor)
-
-        return graph
+    def reset(self):
+        """
+        Reset the game to the initial position from the config.
+
+        The board_state dict and the cells array are cleared in place rather than
+        replaced, so references to them stay valid.
+        """
+        self.current_player = Player.P1
+        self.game_over = False
+        self.winner = None
+        self.win_reason = None
+        self.capture_sequence = False
+        self.capturing_piece = None
+        self.move_count = 0
+        self.last_captured_piece = None
+        self.initial_piece_counts = None
+
+        # Set up the position once, then restore it from a snapshot
+        if self._initial_position is None:
+            self._setup_initial_pieces()
+            self._initial_position = (
+                dict(self._board_state),
+                self.cells.copy(),
+                tuple(self.piece_bb),
+                self.p1_bb,
+                self.p2_bb,
+            )
+        else:
+            board_state, cells, piece_bb, self.p1_bb, self.p2_bb = (
+                self._initial_position
+            )
+            self._board_state.update(board_state)
+            self.cells[:] = cells
+            self.piece_bb[:] = piece_bb
+            self._valid_moves = None
 
     def _setup_initial_pieces(self):
         """Set up the initial game position from the config."""
-        # Initialize empty board
-        self.board_state = dict.fromkeys(self.nodes, PieceType.EMPTY)
-        self.p1_pieces.clear()
-        self.p2_pieces.clear()
-
-        # Add P1 pieces using the proper method
-        for piece_type, positions in self.config.p1_setup.items():
-            for pos in positions:
-                self.add_piece(pos, piece_type)
-
-        # Add P2 pieces using the proper method
-        for piece_type, positions in self.config.p2_setup.items():
-            for pos in positions:
-                self.add_piece(pos, piece_type)
+        # Initialize empty board, clearing the current one in place when it
+        # already covers every position
+        if len(self._board_state) == len(self.nodes):
+            board_state = self._board_state
+            for pos in board_state:
+                board_state[pos] = PieceType.EMPTY
+        else:
+            board_state = dict.fromkeys(self.nodes, PieceType.EMPTY)
+
+        # Place the pieces straight into the dict, skipping off-board and taken
+        # positions like add_piece does, then derive the cells and bitboards once
+        for pos, piece_type in self.core.initial_layout:
+            if board_state.get(pos) == PieceType.EMPTY:
+                board_state[pos] = piece_type
+        self.board_state = board_state
 
     def add_piece(self, pos: tuple[float, float], piece_type: PieceType) -> bool:
         """
@@ -119,21 +276,25 @@ class DabloGame:
             True if piece was successfully added, False if position is invalid or occupied
         """
         # Validate position exists on board
-        if pos not in self.board_state:
+        if pos not in self._board_state:
             return False
 
         # Check if position is already occupied
-        if self.board_state[pos] != PieceType.EMPTY:
+        cell = self.geometry.cell_index[pos]
+        if self.cells[cell] != PieceType.EMPTY:
             return False
 
         # Add piece to board state
-        self.board_state[pos] = piece_type
-
-        # Update piece tracking sets
-        if piece_type.value > 0:  # Player 1 piece
-            self.p1_pieces.add(pos)
-        elif piece_type.value < 0:  # Player 2 piece
-            self.p2_pieces.add(pos)
+        self._board_state[pos] = piece_type
+        self.cells[cell] = piece_type
+        self._valid_moves = None
+
+        # Update the bitboards
+        self.piece_bb[piece_type] |= 1 << cell
+        if piece_type > 0:  # Player 1 piece
+            self.p1_bb |= 1 << cell
+        elif piece_type < 0:  # Player 2 piece
+            self.p2_bb |= 1 << cell
         # Note: EMPTY pieces don't need to be tracked
 
         return True
@@ -148,26 +309,35 @@ class DabloGame:
         Returns:
             The piece type that was removed, or PieceType.EMPTY if no piece was there
         """
+        cell = self.geometry.cell_index.get(pos)
+        if cell is None:
+            return PieceType.EMPTY
+
         # Get the piece type before removing
-        removed_piece = self.board_state.get(pos, PieceType.EMPTY)
+        removed_piece = self._board_state.get(pos, PieceType.EMPTY)
 
         # Remove from board state
-        self.board_state[pos] = PieceType.EMPTY
+        self._board_state[pos] = PieceType.EMPTY
+        self.cells[cell] = PieceType.EMPTY
+        self._valid_moves = None
 
-        # Update piece tracking sets
-        if removed_piece.value > 0:  # Was Player 1 piece
-            self.p1_pieces.discard(pos)
-        elif removed_piece.value < 0:  # Was Player 2 piece
-            self.p2_pieces.discard(pos)
+        # Update the bitboards
+        cell_mask = ~(1 << cell)
+        self.piece_bb[removed_piece] &= cell_mask
+        self.p1_bb &= cell_mask
+        self.p2_bb &= cell_mask
 
         return removed_piece
 
     def clear_board(self):
         """Clear all pieces from the board."""
-        for pos in self.board_state:
-            self.board_state[pos] = PieceType.EMPTY
-        self.p1_pieces.clear()
-        self.p2_pieces.clear()
+        for pos in self._board_state:
+            self._board_state[pos] = PieceType.EMPTY
+        self.cells.fill(PieceType.EMPTY)
+        self.piece_bb = [0] * len(PieceType)
+        self.p1_bb = 0
+        self.p2_bb = 0
+        self._valid_moves = None
 
     def setup_custom_position(self, pieces: dict[tuple[float, float], PieceType]):
         """
@@ -186,72 +356,119 @@ class DabloGame:
 
     def get_valid_moves(self, pos: tuple[float, float]) -> list[Move]:
         """Get all valid moves for a piece at given position"""
-        piece: PieceType | None = self.board_state.get(pos)
-        if not piece or (piece.value > 0) != (self.current_player > 0):
+        cell = self.geometry.cell_index.get(pos)
+        if cell is None or self.cells[cell] * self.current_player <= 0:
             return []
 
-        all_possible_moves = []
-        for neighbor_pos in self.nodes.get(pos, []):
-            target_piece = self.board_state.get(neighbor_pos, PieceType.EMPTY)
-
-            # Regular move to empty position
-            if target_piece == PieceType.EMPTY:
-                if GameRules.is_valid_regular_move(
-                    pos, neighbor_pos, piece, self.board_state, self.nodes
-                ):
-                    all_possible_moves.append(Move(from_pos=pos, to_pos=neighbor_pos))
+        return generate_moves(
+            self.cells, self.current_player, self.geometry, from_cell=cell
+        )
 
-            # Capture move
-            else:
-                is_opponent = piece.value * target_piece.value < 0
-                if is_opponent:
-                    # Calculate landing position
-                    landing_pos = MovementValidator.calculate_capture_landing(
-                        pos, neighbor_pos
-                    )
+    def get_valid_moves_from(self, pos: tuple[float, float]) -> list[Move]:
+        """
+        Get the valid moves of the piece at pos this turn (none but the capturing
+        piece's during a chain capture)
+        """
+        moves = self._get_cached_moves()
+        if self._moves_by_from is None or self._moves_by_from[0] is not moves:
+            # Regrouped whenever the move list is regenerated (as a new list)
+            moves_by_from: dict[tuple[float, float], list[Move]] = {}
+            for move in moves:
+                moves_by_from.setdefault(move.from_pos, []).append(move)
+            self._moves_by_from = (moves, moves_by_from)
 
-                    if GameRules.is_valid_capture_move(
-                        pos,
-                        neighbor_pos,
-                        landing_pos,
-                        piece,
-                        target_piece,
-                        self.board_state,
-                        self.nodes,
-                    ):
-                        all_possible_moves.append(
-                            Move(
-                                from_pos=pos,
-                                to_pos=landing_pos,
-                                capture_pos=neighbor_pos,
-                            )
-                        )
-
-        return all_possible_moves
+        return list(self._moves_by_from[1].get(pos, ()))
 
     def get_all_valid_moves(self) -> list[Move]:
         """Get all valid moves for current player"""
+        return list(self._get_cached_moves())
+
+    def _get_cached_moves(self) -> list[Move]:
+        """Get the cached list of valid moves, generating it if needed (not a copy)"""
+        # A partial list from has_any_valid_move is regenerated in full
+        if not self._cached_moves_current() or self._valid_moves_partial:
+            self._valid_moves = list(self._iter_turn_moves())
+            self._valid_moves_partial = False
+            self._valid_moves_turn = self._turn
+
+        return self._valid_moves
+
+    def has_any_valid_move(self) -> bool:
+        """Check if the current player has a valid move, stopping at the first one"""
+        if not self._cached_moves_current():
+            # Cache only the first move, so the game holds no live generator and
+            # stays picklable; an empty list is already the full one
+            self._valid_moves = list(islice(self._iter_turn_moves(), 1))
+            self._valid_moves_partial = bool(self._valid_moves)
+            self._valid_moves_turn = self._turn
+
+        return bool(self._valid_moves)
+
+    @property
+    def _turn(self) -> tuple[Player, bool, tuple[float, float] | None]:
+        """The turn state the valid moves depend on, besides the board"""
+        return self.current_player, self.capture_sequence, self.capturing_piece
+
+    def _cached_moves_current(self) -> bool:
+        """
+        Check if the cached moves are for the current board and turn. The cache is
+        cleared by every board update; the turn state is public, so it is compared
+        rather than tracked.
+        """
+        return self._valid_moves is not None and self._valid_moves_turn == self._turn
+
+    def _iter_turn_moves(self) -> Iterator[Move]:
+        """Iterate the valid moves for the current turn"""
         # If in capture sequence, only the capturing piece can move
         if self.capture_sequence and self.capturing_piece:
-            return self.get_valid_moves(self.capturing_piece)
+            cell = self.geometry.cell_index.get(self.capturing_piece)
+            if cell is None:
+                return iter(())
+            return iter_moves(
+                self.cells, self.current_player, self.geometry, from_cell=cell
+            )
 
-        moves = []
-        player_pieces = (
-            self.p1_pieces if self.current_player == Player.P1 else self.p2_pieces
-        )
-        for pos in player_pieces:
-            moves.extend(self.get_valid_moves(pos))
-        return moves
+        return iter_moves(self.cells, self.current_player, self.geometry)
 
     def get_king_position(self, player: Player) -> tuple[float, float] | None:
         """Get king position for specified player"""
+        king_cell = self._get_king_cell(player)
+        return None if king_cell is None else self.geometry.positions[king_cell]
+
+    def _get_king_cell(self, player: Player) -> int | None:
+        """Get king cell for specified player"""
         king_type = PieceType.P1_KING if player == Player.P1 else PieceType.P2_KING
-        player_pieces = self.p1_pieces if player == Player.P1 else self.p2_pieces
+        king_bb = self.piece_bb[king_type]
+        return (king_bb & -king_bb).bit_length() - 1 if king_bb else None
 
-        for pos in player_pieces:
-            if self.board_state[pos] == king_type:
-                return pos
-        return None
+    def get_center_control(self) -> tuple[int, int]:
+        """
+        Calculate center control for both players (p1_control, p2_control), like
+        GameUtils.calculate_center_control but from the player bitboards
+        """
+        center_mask = GameUtils.get_center_mask(self.geometry.positions)
+        p1_control = (self.p1_bb & center_mask).bit_count()
+        p2_control = (self.p2_bb & center_mask).bit_count()
+        return p1_control, p2_control
+
+    def get_board_features(self) -> dict[str, Any]:
+        """
+        Get the features of GameUtils.analyze_board_features for this game, with the
+        piece counts and center control taken from the bitboards
+        """
+        piece_counts = {
+            piece: self.piece_bb[piece].bit_count()
+            for piece in PieceType
+            if piece != PieceType.EMPTY
+        }
+        return GameUtils.analyze_board_features(
+            self.board_state,
+            self.move_count,
+            self.get_king_position(Player.P1),
+            self.get_king_position(Player.P2),
+            piece_counts=piece_counts,
+            center_control=self.get_center_control(),
+        )
 
     def make_move(self, move: Move) -> tuple[bool, dict[str, Any]]:
         """Execute a move and return success status and move info"""
@@ -273,17 +490,20 @@ class DabloGame:
             self.last_captured_piece = captured_piece
             move_info.update({"is_capture": True, "captured_piece": captured_piece})
 
-            # Check for chain captures (only captures from the new position are valid)
-            additional_captures = [
-                m for m in self.get_valid_moves(move.to_pos) if m.is_capture
-            ]
-
-            # Prevent moving back to the starting square in the same turn
-            additional_captures = [
-                m for m in additional_captures if m.to_pos != move.from_pos
-            ]
+            # Check for chain captures (only captures from the new position are
+            # valid, and moving back to the starting square in the same turn is
+            # not), stopping at the first one found
+            chain_capture_available = any(
+                m.is_capture and m.to_pos != move.from_pos
+                for m in iter_moves(
+                    self.cells,
+                    self.current_player,
+                    self.geometry,
+                    from_cell=self.geometry.cell_index[move.to_pos],
+                )
+            )
 
-            if additional_captures:
+            if chain_capture_available:
                 self.capture_sequence = True
                 self.capturing_piece = move.to_pos
                 move_info["chain_capture_available"] = True
@@ -300,19 +520,17 @@ class DabloGame:
     def _check_game_state(self):
         """Check if game has ended and determine winner"""
 
-        # Generate the list of moves ONCE.
-        has_valid_moves = bool(self.get_all_valid_moves())
-
-        p1_king_pos = self.get_king_position(Player.P1)
-        p2_king_pos = self.get_king_position(Player.P2)
+        # Only whether a move exists matters here; the rest of the moves are
+        # generated if and when the caller asks for them
+        has_valid_moves = self.has_any_valid_move()
 
         winner, reason = GameRules.check_win_condition(
-            p1_pieces_count=len(self.p1_pieces),
-            p2_pieces_count=len(self.p2_pieces),
-            p1_king_exists=p1_king_pos is not None,
-            p2_king_exists=p2_king_pos is not None,
+            p1_pieces_count=self.p1_bb.bit_count(),
+            p2_pieces_count=self.p2_bb.bit_count(),
+            p1_king_exists=self._get_king_cell(Player.P1) is not None,
+            p2_king_exists=self._get_king_cell(Player.P2) is not None,
             move_count=self.move_count,
-            move_limit=self.config.move_limit,
+            move_limit=self.core.move_limit,
             has_valid_moves=has_valid_moves,
             current_player=self.current_player,
         )
@@ -328,7 +546,8 @@ class DabloGame:
 
     def make_random_move(self) -> tuple[bool, dict[str, Any]]:
         """Make a random valid move (for AI opponent)"""
-        valid_moves = self.get_all_valid_moves()
+        # The move is picked from the cached list directly, since it is not kept
+        valid_moves = self._get_cached_moves()
         if not valid_moves:
             return False, {"error": "No valid moves"}
 
@@ -345,20 +564,12 @@ class DabloGame:
                 f"!! Chain capture required for piece at {self.capturing_piece} !!"
             )
 
-        rows_to_render: dict[float, list[tuple[float, float]]] = {}
-        for r, c in self.positions:
-            if r not in rows_to_render:
-                rows_to_render[r] = []
-            rows_to_render[r].append((r, c))
-
-        for r in sorted(rows_to_render.keys()):
+        for r, row_positions in _get_render_rows(self.geometry.positions):
             row_str = f"{r: >3.1f} |"
             if r != int(r):
                 row_str += "  "  # Indent secondary rows
 
-            # Sort columns to ensure consistent order
-            sorted_cols = sorted(rows_to_render[r], key=lambda pos: pos[1])
-            for pos in sorted_cols:
+            for pos in row_positions:
                 piece = self.board_state.get(pos)
                 row_str += get_piece_symbol(piece) if piece is not None else "   "
             lines.append(row_str)
@@ -6,8 +6,7 @@ sørsamisk dablo variant.
 """
 
 from enum import IntEnum
-
-from pydantic import BaseModel, Field
+from typing import NamedTuple
 
 
 class PieceType(IntEnum):
@@ -22,11 +21,12 @@ class PieceType(IntEnum):
     P2_KING = -3
 
 
-class PiecePosition(BaseModel):
-    """Represents a piece and its position with validation"""
+class PiecePosition(NamedTuple):
+    """Represents a piece and its position (a plain (piece_type, position) tuple)"""
 
-    piece_type: PieceType = Field(description="Type of piece")
-    position: tuple[float, float] = Field(description="Position on board as (row, col)")
+    piece_type: PieceType
+    # Position on board as (row, col)
+    position: tuple[float, float]
 
 
 # Base piece values for AI evaluation (mapped by rank)
@@ -37,6 +37,12 @@ BASE_PIECE_VALUES: dict[int, float] = {
     3: 10.0,  # KING
 }
 
+# Strategic value by piece value, for lookups in evaluation loops: index directly
+# with a PieceType or board cell value (negative values index from the end)
+PIECE_VALUES: tuple[float, ...] = tuple(
+    BASE_PIECE_VALUES[abs(value)] for value in (0, 1, 2, 3, -3, -2, -1)
+)
+
 # Display symbols for each piece type
 PIECE_SYMBOLS: dict[PieceType, str] = {
     PieceType.EMPTY: " · ",
@@ -77,8 +83,7 @@ def get_piece_rank(piece: PieceType) -> int:
 
 def get_piece_value(piece: PieceType) -> float:
     """Get strategic value of a piece for AI evaluation"""
-    rank = abs(piece.value)
-    return BASE_PIECE_VALUES.get(rank, 0.0)
+    return PIECE_VALUES[piece]
 
 
 def can_capture(attacker: PieceType, target: PieceType) -> bool:
@@ -90,17 +95,22 @@ def can_capture(attacker: PieceType, target: PieceType) -> bool:
     - Princes can capture warriors and princes
     - Kings can capture any piece
     """
-    # Cannot capture empty pieces
-    if target == PieceType.EMPTY or attacker == PieceType.EMPTY:
-        return False
+    return CAN_CAPTURE[attacker][target]
 
-    # Same player cannot capture each other
-    if (attacker > 0) == (target > 0):
-        return False
 
-    # Use piece ranks for capture rules
-    attacker_rank = abs(attacker.value)
-    target_rank = abs(target.value)
+def _can_capture(attacker: int, target: int) -> bool:
+    """Capture rule behind CAN_CAPTURE, for piece values"""
+    # Cannot capture empty pieces, and the same player cannot capture each other
+    if attacker * target >= 0:
+        return False
 
     # A piece can capture another if its rank is >= target rank
-    return attacker_rank >= target_rank
+    return abs(attacker) >= abs(target)
+
+
+# Whether a piece can capture another, indexed [attacker][target] by piece value
+# (negative values index from the end, like PIECE_VALUES)
+CAN_CAPTURE: tuple[tuple[bool, ...], ...] = tuple(
+    tuple(_can_capture(attacker, target) for target in (0, 1, 2, 3, -3, -2, -1))
+    for attacker in (0, 1, 2, 3, -3, -2, -1)
+)
@@ -6,8 +6,7 @@ as documented by Anders and Hanna Nilsson from Frostviken.
 """
 
 from enum import Enum
-
-from pydantic import BaseModel, Field, computed_field
+from typing import NamedTuple
 
 from .pieces import PieceType, can_capture
 from .player import Player
@@ -32,27 +31,58 @@ WIN_DESCRIPTIONS: dict[WinReason, str] = {
 }
 
 
-class Move(BaseModel, frozen=True):
+class Move(NamedTuple):
     """
-    Represents a move in sørsamisk dablo with validation
+    Represents a move in sørsamisk dablo
 
     Moves can be either regular moves (to empty space) or captures (jumping over opponent).
     Chain captures are handled by making multiple consecutive Move objects.
+
+    A Move is a tuple of all six fields, positions first: it unpacks, indexes and
+    orders as one, and _asdict()/_replace() include the cell indices. Its identity
+    (equality, hashing) and repr use only the three positions.
     """
 
-    from_pos: tuple[float, float] = Field(description="Starting position (row, col)")
-    to_pos: tuple[float, float] = Field(description="Destination position (row, col)")
-    capture_pos: tuple[float, float] | None = Field(
-        default=None, description="Position of captured piece (if any)"
-    )
+    # Starting and destination positions (row, col)
+    from_pos: tuple[float, float]
+    to_pos: tuple[float, float]
+    # Position of captured piece (if any)
+    capture_pos: tuple[float, float] | None = None
+
+    # Board cell indices of the positions (see BoardGeometry), filled in by move
+    # generation so evaluators can index board arrays without a position lookup.
+    # They are derived data and take no part in equality or hashing.
+    from_cell: int | None = None
+    to_cell: int | None = None
+    capture_cell: int | None = None
+
+    def __eq__(self, other: object) -> bool:
+        """
+        Moves are equal when their positions are, with or without cell indices. A
+        Move never equals a plain tuple.
+        """
+        return isinstance(other, Move) and self[:3] == other[:3]
+
+    def __ne__(self, other: object) -> bool:
+        """Negation of __eq__ (tuple.__ne__ would compare all the fields)"""
+        return not self == other
+
+    def __hash__(self) -> int:
+        """Hash the positions only, consistent with __eq__"""
+        return hash(self[:3])
+
+    def __repr__(self) -> str:
+        """Show the positions only, leaving out the derived cell indices"""
+        return (
+            f"Move(from_pos={self.from_pos!r}, to_pos={self.to_pos!r}, "
+            f"capture_pos={self.capture_pos!r})"
+        )
 
-    @computed_field
     @property
     def is_capture(self) -> bool:
         """Check if this move represents a capture"""
         return self.capture_pos is not None
 
-    @computed_field
     @property
     def distance(self) -> float:
         """Calculate the distance of this move"""
@@ -5,9 +5,11 @@ Provides helper functions for common game operations like piece counting,
 position analysis, board state queries, and game statistics.
 """
 
-from functools import lru_cache
+from functools import cache, lru_cache
 from typing import Any
 
+import numpy as np
+
 from .pieces import PieceType
 
 
@@ -40,6 +42,18 @@ class GameUtils:
             (2.5, 3.0),
         ]
 
+    @staticmethod
+    @cache
+    def get_center_mask(positions: tuple[tuple[float, float], ...]) -> int:
+        """
+        Bitmask of the center cells of a board, given its cell positions (see
+        BoardGeometry)
+        """
+        center_positions = GameUtils.get_center_positions()
+        return sum(
+            1 << cell for cell, pos in enumerate(positions) if pos in center_positions
+        )
+
     @staticmethod
     def calculate_center_control(
         board_state: dict[tuple[float, float], PieceType],
@@ -54,9 +68,9 @@ class GameUtils:
         for pos in center_positions:
             piece = board_state.get(pos, PieceType.EMPTY)
 
-            if piece.value > 0:
+            if piece > 0:
                 p1_control += 1
-            elif piece.value < 0:
+            elif piece < 0:
                 p2_control += 1
 
         return p1_control, p2_control
@@ -67,12 +81,21 @@ class GameUtils:
         move_count: int,
         p1_king_pos: tuple[float, float] | None = None,
         p2_king_pos: tuple[float, float] | None = None,
+        piece_counts: dict[PieceType, int] | None = None,
+        center_control: tuple[int, int] | None = None,
     ) -> dict[str, Any]:
         """
         Get advanced features for reward calculation. This logic was moved from DabloGame.
+
+        Callers that already know the piece counts by type or the center control
+        (see DabloGame.get_board_features) can pass them to skip the board scans.
         """
         # Count all pieces by type and player
-        piece_counts_by_type = GameUtils.count_pieces(board_state)
+        piece_counts_by_type = (
+            GameUtils.count_pieces(board_state)
+            if piece_counts is None
+            else piece_counts
+        )
 
         p1_warriors = piece_counts_by_type.get(PieceType.P1_WARRIOR, 0)
         p1_princes = piece_counts_by_type.get(PieceType.P1_PRINCE, 0)
@@ -86,9 +109,9 @@ class GameUtils:
         p2_total_pieces = p2_warriors + p2_princes + p2_kings
 
         # Calculate center control
-        p1_center_control, p2_center_control = GameUtils.calculate_center_control(
-            board_state
-        )
+        if center_control is None:
+            center_control = GameUtils.calculate_center_control(board_state)
+        p1_center_control, p2_center_control = center_control
 
         features = {
             "p1_pieces": p1_total_pieces,
@@ -107,3 +130,64 @@ class GameUtils:
             "move_count": move_count,
         }
         return features
+
+    @staticmethod
+    def analyze_board_features_batch(
+        boards: np.ndarray,
+        move_counts: np.ndarray,
+        positions: tuple[tuple[float, float], ...],
+    ) -> dict[str, np.ndarray]:
+        """
+        Get the features of analyze_board_features for a batch of boards at once.
+
+        ``boards`` is a (batch, cells) array of int8 cell boards (see BoardGeometry)
+        with the cell ``positions``. Each feature is an array over the batch; the
+        king positions are given as cells instead (-1 for a missing king).
+        """
+        boards = np.asarray(boards)
+        counts = {
+            piece: np.count_nonzero(boards == piece, axis=1)
+            for piece in PieceType
+            if piece != PieceType.EMPTY
+        }
+
+        p1_warriors = counts[PieceType.P1_WARRIOR]
+        p1_princes = counts[PieceType.P1_PRINCE]
+        p1_kings = counts[PieceType.P1_KING]
+
+        p2_warriors = counts[PieceType.P2_WARRIOR]
+        p2_princes = counts[PieceType.P2_PRINCE]
+        p2_kings = counts[PieceType.P2_KING]
+
+        p1_total_pieces = p1_warriors + p1_princes + p1_kings
+        p2_total_pieces = p2_warriors + p2_princes + p2_kings
+
+        # Calculate center control over the center cells' columns
+        center_positions = GameUtils.get_center_positions()
+        center_cells = [
+            cell for cell, pos in enumerate(positions) if pos in center_positions
+        ]
+        center = boards[:, center_cells]
+
+        return {
+            "p1_pieces": p1_total_pieces,
+            "p2_pieces": p2_total_pieces,
+            "p1_warriors": p1_warriors,
+            "p1_princes": p1_princes,
+            "p1_kings": p1_kings,
+            "p2_warriors": p2_warriors,
+            "p2_princes": p2_princes,
+            "p2_kings": p2_kings,
+            "piece_difference": p1_total_pieces - p2_total_pieces,
+            "p1_king_cell": GameUtils._find_cells(boards, PieceType.P1_KING),
+            "p2_king_cell": GameUtils._find_cells(boards, PieceType.P2_KING),
+            "p1_center_control": np.count_nonzero(center > 0, axis=1),
+            "p2_center_control": np.count_nonzero(center < 0, axis=1),
+            "move_count": np.asarray(move_counts),
+        }
+
+    @staticmethod
+    def _find_cells(boards: np.ndarray, piece: PieceType) -> np.ndarray:
+        """First cell holding ``piece`` on each board of a batch, or -1 if none"""
+        found = boards == piece
+        return np.where(found.any(axis=1), found.argmax(axis=1), -1)
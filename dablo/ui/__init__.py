@@ -2,10 +2,18 @@
 UI module for Dablo game visualization
 
 Provides easy-to-use visualization tools for the Dablo game.
+
+The UI modules import matplotlib, which is slow to load, so they are only
+imported when one of their classes or functions is first accessed.
 """
 
-from .interactive import InteractiveDabloGame, play_interactive_dablo
-from .visualizer import DabloVisualizer, quick_visualize
+from importlib import import_module
+from typing import TYPE_CHECKING
+
+
+if TYPE_CHECKING:
+    from .interactive import InteractiveDabloGame, play_interactive_dablo
+    from .visualizer import DabloVisualizer, quick_visualize
 
 
 __all__ = [
@@ -14,3 +22,19 @@ __all__ = [
     "InteractiveDabloGame",
     "play_interactive_dablo",
 ]
+
+# Submodule defining each exported name
+_EXPORT_MODULES = {
+    "DabloVisualizer": ".visualizer",
+    "quick_visualize": ".visualizer",
+    "InteractiveDabloGame": ".interactive",
+    "play_interactive_dablo": ".interactive",
+}
+
+
+def __getattr__(name: str):
+    """Import an exported name's submodule on first access"""
+    module_name = _EXPORT_MODULES.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    return getattr(import_module(module_name, __name__), name)
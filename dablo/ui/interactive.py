@@ -4,8 +4,13 @@ Interactive Dablo game using matplotlib
 Click-to-play interface for the Dablo game with mouse interaction.
 """
 
+from itertools import zip_longest
+from math import floor
+from typing import NamedTuple
+
 from matplotlib.patches import Circle
 import matplotlib.pyplot as plt
+from matplotlib.text import Text
 
 from ..core.game import DabloGame
 from ..core.pieces import PieceType
@@ -14,6 +19,28 @@ from ..core.rules import Move
 from .visualizer import DabloVisualizer
 
 
+# Clicks within this distance of a board position select it; also the cell size
+# of the click lookup grid, so a position in range is at most one cell away
+_CLICK_TOLERANCE = 0.2
+
+
+class _UndoEntry(NamedTuple):
+    """A move made in the game and the game state needed to take it back"""
+
+    move: Move
+    captured_piece: PieceType
+    # Whether the NPC made the move; undo takes back the human's last move
+    # together with the NPC moves that answered it
+    by_npc: bool
+    current_player: Player
+    move_count: int
+    capture_sequence: bool
+    capturing_piece: tuple[float, float] | None
+    game_over: bool
+    winner: Player | None
+    win_reason: str | None
+
+
 class InteractiveDabloGame:
     """Interactive Dablo game with click-to-play interface"""
 
@@ -25,8 +52,14 @@ class InteractiveDabloGame:
 
         # Game state
         self.selected_piece = None
-        self.valid_moves_for_piece = []
-        self.game_history = []
+        # Moves of the selected piece by destination
+        self.valid_moves_for_piece: dict[tuple[float, float], Move] = {}
+        self.game_history: list[_UndoEntry] = []
+
+        # Board positions bucketed by click grid cell
+        self._pos_grid: dict[tuple[int, int], list[tuple[float, float]]] = {}
+        for pos in self.game.positions:
+            self._pos_grid.setdefault(self._grid_key(pos[0], pos[1]), []).append(pos)
 
         # Create NPC if needed
         self.npc_player = None
@@ -39,6 +72,18 @@ class InteractiveDabloGame:
         self.fig = None
         self.ax = None
 
+        # Blitting state: the cached image of the static board (grid and pieces),
+        # the board geometry and cells it shows, and the artists drawn over it on
+        # each update
+        self._background = None
+        self._drawn_geometry = None
+        self._drawn_cells: bytes | None = None
+        self._piece_circles = None
+        self._piece_symbols: dict[tuple[float, float], Text] = {}
+        self._selection_ring: Circle | None = None
+        self._move_markers: list[Circle] = []
+        self._status_text = None
+
     def start_game(self):
         """Start the interactive game"""
         print("🎮 Starting Interactive Dablo Game!")
@@ -48,6 +93,7 @@ class InteractiveDabloGame:
         self.fig, self.ax = plt.subplots(figsize=self.visualizer.figsize)
         self.fig.canvas.mpl_connect("button_press_event", self._on_click)
         self.fig.canvas.mpl_connect("key_press_event", self._on_key)
+        self.fig.canvas.mpl_connect("draw_event", self._on_draw)
 
         self._update_display()
         plt.show()
@@ -69,6 +115,11 @@ class InteractiveDabloGame:
         else:
             self._try_make_move(clicked_pos)
 
+    def _on_draw(self, event):
+        """Cache the static board after a full redraw (first draw or resize)"""
+        self._background = self.fig.canvas.copy_from_bbox(self.ax.bbox)
+        self._draw_dynamic_artists()
+
     def _on_key(self, event):
         """Handle keyboard events"""
         if event.key == "escape":
@@ -89,18 +140,27 @@ class InteractiveDabloGame:
         game_row = -y
         game_col = x
 
-        # Find closest valid position
-        min_dist = float("inf")
+        # Find closest valid position among the neighbouring grid cells, comparing
+        # squared distances
+        min_dist = _CLICK_TOLERANCE**2
         closest_pos = None
 
-        for pos in self.game.positions:
-            dist = ((pos[0] - game_row) ** 2 + (pos[1] - game_col) ** 2) ** 0.5
-            if dist < min_dist and dist < 0.2:  # Within click tolerance
-                min_dist = dist
-                closest_pos = pos
+        key_row, key_col = self._grid_key(game_row, game_col)
+        for grid_row in (key_row - 1, key_row, key_row + 1):
+            for grid_col in (key_col - 1, key_col, key_col + 1):
+                for pos in self._pos_grid.get((grid_row, grid_col), ()):
+                    dist = (pos[0] - game_row) ** 2 + (pos[1] - game_col) ** 2
+                    if dist < min_dist:
+                        min_dist = dist
+                        closest_pos = pos
 
         return closest_pos
 
+    @staticmethod
+    def _grid_key(row: float, col: float) -> tuple[int, int]:
+        """Click lookup grid cell containing a (row, col) point"""
+        return floor(row / _CLICK_TOLERANCE), floor(col / _CLICK_TOLERANCE)
+
     def _try_select_piece(self, pos: tuple[float, float]):
         """Try to select a piece at the given position"""
         piece = self.game.board_state.get(pos, PieceType.EMPTY)
@@ -108,9 +168,7 @@ class InteractiveDabloGame:
         # Check if it's the current player's piece
         if self.game.current_player == Player.P1 and piece.value > 0:
             self.selected_piece = pos
-            self.valid_moves_for_piece = [
-                move for move in self.game.get_all_valid_moves() if move.from_pos == pos
-            ]
+            self.valid_moves_for_piece = self._get_moves_from(pos)
             print(f"Selected {piece.name} at {pos}")
             print(f"Available moves: {len(self.valid_moves_for_piece)}")
             self._update_display()
@@ -119,11 +177,7 @@ class InteractiveDabloGame:
             # Only allow if playing vs human
             if not self.vs_npc:
                 self.selected_piece = pos
-                self.valid_moves_for_piece = [
-                    move
-                    for move in self.game.get_all_valid_moves()
-                    if move.from_pos == pos
-                ]
+                self.valid_moves_for_piece = self._get_moves_from(pos)
                 print(f"Selected {piece.name} at {pos}")
                 self._update_display()
             else:
@@ -138,12 +192,7 @@ class InteractiveDabloGame:
             self._deselect_piece()
             return
 
-        # Find move that goes to this position
-        target_move = None
-        for move in self.valid_moves_for_piece:
-            if move.to_pos == pos:
-                target_move = move
-                break
+        target_move = self.valid_moves_for_piece.get(pos)
 
         if target_move:
             self._execute_move(target_move)
@@ -155,10 +204,7 @@ class InteractiveDabloGame:
         """Execute a move and update game state"""
         print(f"Moving from {move.from_pos} to {move.to_pos}")
 
-        # Save current state for undo
-        self.game_history.append(self._save_game_state())
-
-        success, move_info = self.game.make_move(move)
+        success, move_info = self._apply_move(move)
 
         if success:
             if move_info.get("is_capture"):
@@ -167,11 +213,7 @@ class InteractiveDabloGame:
             if move_info.get("chain_capture_available"):
                 print("Chain capture available! Select the piece again to continue.")
                 # Keep the same piece selected for chain capture
-                self.valid_moves_for_piece = [
-                    m
-                    for m in self.game.get_all_valid_moves()
-                    if m.from_pos == move.to_pos
-                ]
+                self.valid_moves_for_piece = self._get_moves_from(move.to_pos)
             else:
                 self._deselect_piece()
 
@@ -192,14 +234,13 @@ class InteractiveDabloGame:
             return
 
         print("NPC is thinking...")
-        self.fig.canvas.draw()
-        plt.pause(0.5)  # Brief pause for realism
+        self._pause(0.5)  # Brief pause for realism
 
         npc_move = self.npc_player.get_move(self.game)
 
         if npc_move:
             print(f"NPC moves from {npc_move.from_pos} to {npc_move.to_pos}")
-            success, move_info = self.game.make_move(npc_move)
+            success, move_info = self._apply_move(npc_move, by_npc=True)
 
             if success:
                 if move_info.get("is_capture"):
@@ -210,14 +251,14 @@ class InteractiveDabloGame:
                     move_info.get("chain_capture_available") and not self.game.game_over
                 ):
                     self._update_display()
-                    plt.pause(0.5)
+                    self._pause(0.5)
 
                     npc_move = self.npc_player.get_move(self.game)
                     if npc_move:
                         print(
                             f"NPC chain capture: {npc_move.from_pos} to {npc_move.to_pos}"
                         )
-                        success, move_info = self.game.make_move(npc_move)
+                        success, move_info = self._apply_move(npc_move, by_npc=True)
                         if not success:
                             break
                     else:
@@ -228,34 +269,109 @@ class InteractiveDabloGame:
                 if self.game.game_over:
                     self._handle_game_over()
 
+    def _pause(self, interval: float):
+        """
+        Wait while keeping the window responsive. Unlike plt.pause, this does not
+        redraw a stale figure; the display is already up to date from blitting.
+        """
+        self.fig.canvas.flush_events()
+        self.fig.canvas.start_event_loop(interval)
+
+    def _apply_move(self, move: Move, by_npc: bool = False) -> tuple[bool, dict]:
+        """Make a move in the game, recording how to undo it"""
+        game = self.game
+        entry_state = (
+            game.current_player,
+            game.move_count,
+            game.capture_sequence,
+            game.capturing_piece,
+            game.game_over,
+            game.winner,
+            game.win_reason,
+        )
+
+        success, move_info = game.make_move(move)
+
+        if success:
+            captured_piece = move_info.get("captured_piece", PieceType.EMPTY)
+            self.game_history.append(
+                _UndoEntry(move, captured_piece, by_npc, *entry_state)
+            )
+
+        return success, move_info
+
+    def _get_moves_from(
+        self, pos: tuple[float, float]
+    ) -> dict[tuple[float, float], Move]:
+        """Valid moves of the piece at pos this turn, keyed by destination"""
+        return {move.to_pos: move for move in self.game.get_valid_moves_from(pos)}
+
     def _deselect_piece(self):
         """Deselect current piece"""
         self.selected_piece = None
-        self.valid_moves_for_piece = []
+        self.valid_moves_for_piece = {}
         self._update_display()
 
     def _update_display(self):
         """Update the visual display"""
-        self.ax.clear()
-
-        # Draw base game
-        self.visualizer._draw_board_grid(self.ax, self.game)
-        self.visualizer._draw_pieces(self.ax, self.game)
+        # The board grid is drawn once per board geometry, and the pieces again
+        # only when they have moved
+        if self.game.geometry is not self._drawn_geometry:
+            self._draw_board()
+        if self.game.cells.tobytes() != self._drawn_cells:
+            self._draw_pieces()
 
         # Highlight selected piece
         if self.selected_piece:
             x, y = self.selected_piece[1], -self.selected_piece[0]
-            circle = Circle((x, y), 0.2, fill=False, ec="yellow", linewidth=4, zorder=5)
-            self.ax.add_patch(circle)
-
-            # Show valid moves for selected piece
-            for move in self.valid_moves_for_piece:
-                x, y = move.to_pos[1], -move.to_pos[0]
+            self._selection_ring.set_center((x, y))
+        self._selection_ring.set_visible(self.selected_piece is not None)
+
+        # Show valid moves for selected piece, hiding the unused markers
+        moves = self.valid_moves_for_piece.values() if self.selected_piece else ()
+        for marker, move in zip_longest(self._move_markers, moves):
+            if move is not None:
+                marker.set_center((move.to_pos[1], -move.to_pos[0]))
                 if move.is_capture:
-                    circle = Circle((x, y), 0.1, color="red", alpha=0.8, zorder=4)
+                    marker.set_radius(0.1)
+                    marker.set_color("red")
                 else:
-                    circle = Circle((x, y), 0.08, color="lime", alpha=0.8, zorder=4)
-                self.ax.add_patch(circle)
+                    marker.set_radius(0.08)
+                    marker.set_color("lime")
+            marker.set_visible(move is not None)
+
+        self._status_text.set_text(self._get_game_status())
+
+        # Blit the dynamic artists over the cached board
+        canvas = self.fig.canvas
+        canvas.restore_region(self._background)
+        self._draw_dynamic_artists()
+        canvas.blit(self.ax.bbox)
+        canvas.flush_events()
+
+    def _draw_board(self):
+        """Draw the board grid and create the artists blitted over the board"""
+        self.ax.clear()
+
+        # Draw base game
+        self.visualizer._draw_board_grid(self.ax, self.game)
+
+        # Animated artists are skipped by full redraws, keeping them out of the
+        # cached background
+        self._selection_ring = Circle(
+            (0, 0), 0.2, fill=False, ec="yellow", linewidth=4, zorder=5
+        )
+        self._selection_ring.set_animated(True)
+        self.ax.add_patch(self._selection_ring)
+
+        # A piece has at most one move per neighbour, so this many markers are
+        # enough for any selection
+        self._move_markers = [
+            Circle((0, 0), 0.08, alpha=0.8, zorder=4, visible=False, animated=True)
+            for _ in range(max(map(len, self.game.geometry.neighbors)))
+        ]
+        for marker in self._move_markers:
+            self.ax.add_patch(marker)
 
         # Add game info
         self._add_game_status()
@@ -263,10 +379,30 @@ class InteractiveDabloGame:
         # Style
         self.visualizer._style_plot(self.ax)
 
+        self._drawn_geometry = self.game.geometry
+        self._drawn_cells = None
+        self._piece_circles = None
+        self._piece_symbols = {}
+
+    def _draw_pieces(self):
+        """Redraw the pieces and re-cache the static board"""
+        # The circles are replaced as one collection; the symbol texts are kept
+        # by position and updated in place
+        if self._piece_circles is not None:
+            self._piece_circles.remove()
+        self._piece_circles = self.visualizer._draw_piece_circles(self.ax, self.game)
+        self.visualizer._draw_piece_symbols(self.ax, self.game, self._piece_symbols)
+
+        self._drawn_cells = self.game.cells.tobytes()
         self.fig.canvas.draw()
 
-    def _add_game_status(self):
-        """Add game status information"""
+    def _draw_dynamic_artists(self):
+        """Draw the status text, move markers and selection ring, bottom to top"""
+        for artist in (self._status_text, *self._move_markers, self._selection_ring):
+            self.ax.draw_artist(artist)
+
+    def _get_game_status(self) -> str:
+        """Game status information for the status box"""
         status_text = (
             f"Move {self.game.move_count} - {self.game.current_player.name}'s turn"
         )
@@ -282,16 +418,22 @@ class InteractiveDabloGame:
             winner_text = self.game.winner.name if self.game.winner else "Draw"
             status_text += f"\n🏆 Game Over - {winner_text} wins!"
 
-        # Position text in top-right corner to avoid blocking game
-        self.ax.text(
+        return status_text
+
+    def _add_game_status(self):
+        """Add the game status box and the controls"""
+        # Position text in top-right corner to avoid blocking game; the status
+        # changes without the board, so it is blitted like the move markers
+        self._status_text = self.ax.text(
             0.98,
             0.98,
-            status_text,
+            "",
             transform=self.ax.transAxes,
             fontsize=10,
             verticalalignment="top",
             horizontalalignment="right",
             bbox={"boxstyle": "round", "facecolor": "white", "alpha": 0.9},
+            animated=True,
         )
 
         # Add compact controls in bottom-right
@@ -321,41 +463,41 @@ class InteractiveDabloGame:
         """Restart the game"""
         self.game = DabloGame()
         self.selected_piece = None
-        self.valid_moves_for_piece = []
+        self.valid_moves_for_piece = {}
         self.game_history = []
         print("🔄 Game restarted!")
         self._update_display()
 
     def _undo_move(self):
-        """Undo last move"""
+        """Undo last move (and the NPC's reply to it)"""
         if self.game_history:
-            self._load_game_state(self.game_history.pop())
+            while self.game_history:
+                entry = self.game_history.pop()
+                self._take_back(entry)
+                if not entry.by_npc:
+                    break
+
             self._deselect_piece()
             print("↶ Move undone!")
         else:
             print("Nothing to undo!")
 
-    def _save_game_state(self) -> dict:
-        """Save current game state"""
-        return {
-            "board_state": self.game.board_state.copy(),
-            "current_player": self.game.current_player,
-            "move_count": self.game.move_count,
-            "capture_sequence": self.game.capture_sequence,
-            "capturing_piece": self.game.capturing_piece,
-            "game_over": self.game.game_over,
-            "winner": self.game.winner,
-        }
-
-    def _load_game_state(self, state: dict):
-        """Load saved game state"""
-        self.game.board_state = state["board_state"]
-        self.game.current_player = state["current_player"]
-        self.game.move_count = state["move_count"]
-        self.game.capture_sequence = state["capture_sequence"]
-        self.game.capturing_piece = state["capturing_piece"]
-        self.game.game_over = state["game_over"]
-        self.game.winner = state["winner"]
+    def _take_back(self, entry: _UndoEntry):
+        """Reverse a recorded move and restore the game state from before it"""
+        game = self.game
+        move = entry.move
+
+        game.add_piece(move.from_pos, game.remove_piece(move.to_pos))
+        if entry.captured_piece != PieceType.EMPTY:
+            game.add_piece(move.capture_pos, entry.captured_piece)
+
+        game.current_player = entry.current_player
+        game.move_count = entry.move_count
+        game.capture_sequence = entry.capture_sequence
+        game.capturing_piece = entry.capturing_piece
+        game.game_over = entry.game_over
+        game.winner = entry.winner
+        game.win_reason = entry.win_reason
 
     def _show_help(self):
         """Show help information"""
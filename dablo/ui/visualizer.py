@@ -5,11 +5,13 @@ Provides a clean, easy-to-use visualization of the game board
 that can be used for debugging, analysis, or demonstrations.
 """
 
+from matplotlib.collections import LineCollection, PatchCollection
 from matplotlib.patches import Circle
 import matplotlib.pyplot as plt
 
 from ..core.game import DabloGame
 from ..core.pieces import PieceType
+from ..core.rules import Move
 
 
 class DabloVisualizer:
@@ -96,15 +98,29 @@ class DabloVisualizer:
         return fig
 
     def _draw_board_grid(self, ax, game: DabloGame):
-        """Draw the board grid and nodes"""
-        # Draw connections between nodes
-        for pos, neighbors in game.nodes.items():
-            x1, y1 = pos[1], -pos[0]  # Flip Y for display
-            for neighbor in neighbors:
-                x2, y2 = neighbor[1], -neighbor[0]
-                ax.plot([x1, x2], [y1, y2], "gray", alpha=0.3, linewidth=1)
+        """Draw the board grid and nodes, each as a single collection"""
+        # Draw connections between nodes, each edge once; the alpha is that of
+        # two overlapping 0.3 lines, as the grid was originally drawn from both
+        # ends (projecting caps and zorder 2 as for plotted lines)
+        segments = [
+            ((pos[1], -pos[0]), (neighbor[1], -neighbor[0]))  # Flip Y for display
+            for pos, neighbors in game.nodes.items()
+            for neighbor in neighbors
+            if pos < neighbor
+        ]
+        ax.add_collection(
+            LineCollection(
+                segments,
+                colors="gray",
+                alpha=0.51,
+                linewidth=1,
+                capstyle="projecting",
+                zorder=2,
+            )
+        )
 
         # Draw nodes
+        nodes = []
         for pos in game.positions:
             x, y = pos[1], -pos[0]  # Flip Y for display
             if pos[0] == int(pos[0]) and pos[1] == int(pos[1]):
@@ -127,28 +143,48 @@ class DabloVisualizer:
                     linewidth=1,
                     zorder=1,
                 )
-            ax.add_patch(circle)
+            nodes.append(circle)
+        ax.add_collection(PatchCollection(nodes, match_original=True, zorder=1))
+
+    def _draw_pieces(self, ax, game: DabloGame) -> list:
+        """Draw all pieces on the board, returning the artists added"""
+        symbols = self._draw_piece_symbols(ax, game, {})
+        return [self._draw_piece_circles(ax, game), *symbols.values()]
+
+    def _draw_piece_circles(self, ax, game: DabloGame) -> PatchCollection:
+        """Draw the pieces as colored circles, in a single collection"""
+        circles = [
+            Circle(
+                (pos[1], -pos[0]),  # Flip Y for display
+                0.12,
+                color=self.colors[piece],
+                ec="black",
+                linewidth=2,
+            )
+            for pos, piece in game.board_state.items()
+            if piece != PieceType.EMPTY
+        ]
+        return ax.add_collection(
+            PatchCollection(circles, match_original=True, zorder=3)
+        )
 
-    def _draw_pieces(self, ax, game: DabloGame):
-        """Draw all pieces on the board"""
+    def _draw_piece_symbols(self, ax, game: DabloGame, texts: dict) -> dict:
+        """
+        Draw the piece symbols, one text per position. ``texts`` holds the texts
+        drawn before by position: those are updated in place (and hidden where
+        the position is now empty), and texts for new positions are added to it.
+        """
         for pos, piece in game.board_state.items():
-            if piece != PieceType.EMPTY:
+            text = texts.get(pos)
+            if piece == PieceType.EMPTY:
+                if text is not None:
+                    text.set_visible(False)
+                continue
+
+            symbol = self.piece_symbols.get(piece, "?")
+            if text is None:
                 x, y = pos[1], -pos[0]  # Flip Y for display
-
-                # Draw piece as colored circle
-                circle = Circle(
-                    (x, y),
-                    0.12,
-                    color=self.colors[piece],
-                    ec="black",
-                    linewidth=2,
-                    zorder=3,
-                )
-                ax.add_patch(circle)
-
-                # Add piece symbol
-                symbol = self.piece_symbols.get(piece, "?")
-                ax.text(
+                texts[pos] = ax.text(
                     x,
                     y,
                     symbol,
@@ -159,10 +195,21 @@ class DabloVisualizer:
                     color="white",
                     zorder=4,
                 )
+            else:
+                text.set_text(symbol)
+                text.set_visible(True)
 
-    def _highlight_valid_moves(self, ax, game: DabloGame):
-        """Highlight valid moves for current player"""
-        valid_moves = game.get_all_valid_moves()
+        return texts
+
+    def _highlight_valid_moves(
+        self, ax, game: DabloGame, valid_moves: list[Move] | None = None
+    ):
+        """
+        Highlight valid moves for current player, from ``valid_moves`` when the
+        caller already has them
+        """
+        if valid_moves is None:
+            valid_moves = game.get_all_valid_moves()
 
         # Highlight pieces that can move
         movable_positions = {move.from_pos for move in valid_moves}
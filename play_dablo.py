@@ -4,8 +4,6 @@ Play Dablo interactively!
 Simple launcher script for the interactive Dablo game.
 """
 
-from dablo.ui import play_interactive_dablo
-
 
 def main():
     """Main launcher function"""
@@ -23,6 +21,9 @@ def main():
     try:
         choice = input("Enter choice (1-4) or press Enter for default: ").strip()
 
+        # Imported only once a game is starting, as matplotlib is slow to load
+        from dablo.ui import play_interactive_dablo
+
         if choice == "1":
             print("🤖 Starting game vs Easy NPC...")
             play_interactive_dablo(vs_npc=True, difficulty="easy")